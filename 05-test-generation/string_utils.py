@@ -6,6 +6,12 @@ Practice module for generating tests.
 EXERCISE: Generate tests for these functions in test_string_utils.py
 """
 
+import re
+
+
+_SLUG_SEPARATOR_PATTERN = re.compile(r'[^a-z0-9]+')
+_EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
 
 def reverse_string(s: str) -> str:
     """Reverse a string."""
@@ -62,11 +68,10 @@ def truncate(s: str, max_length: int, suffix: str = "...") -> str:
 
 def slugify(s: str) -> str:
     """Convert a string to a URL-friendly slug."""
-    import re
     # Convert to lowercase
     s = s.lower()
     # Replace spaces and special characters with hyphens
-    s = re.sub(r'[^a-z0-9]+', '-', s)
+    s = _SLUG_SEPARATOR_PATTERN.sub('-', s)
     # Remove leading/trailing hyphens
     s = s.strip('-')
     return s
@@ -74,9 +79,7 @@ def slugify(s: str) -> str:
 
 def extract_emails(text: str) -> list[str]:
     """Extract all email addresses from a text."""
-    import re
-    pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    return re.findall(pattern, text)
+    return _EMAIL_PATTERN.findall(text)
 
 
 def mask_email(email: str) -> str:
@@ -0,0 +1,90 @@
+"""
+Product Catalog Benchmark
+=========================
+Compares `search_products` (a linear scan per query) with
+ProductCatalog.search on generated products, checking that both return
+the same products in the same order. Also times building the catalog
+and its incremental add/update/remove.
+
+Run from the 10-code-translation folder:
+    python benchmarks/bench_catalog.py [products]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from original_python import Product, search_products  # noqa: E402
+from product_catalog import ProductCatalog  # noqa: E402
+
+ADJECTIVES = ['Classic', 'Smart', 'Wireless', 'Compact', 'Deluxe', 'Eco', 'Ultra',
+              'Portable', 'Vintage', 'Premium', 'Rugged', 'Mini']
+NOUNS = ['Phone', 'Headphones', 'Lamp', 'Backpack', 'Kettle', 'Watch', 'Camera',
+         'Speaker', 'Keyboard', 'Blender', 'Jacket', 'Drone', 'Tent', 'Mug']
+CATEGORIES = [f'category-{i}' for i in range(40)]
+TAGS = ['sale', 'new', 'bestseller', 'eco-friendly', 'gift', 'limited', 'outdoor',
+        'kitchen', 'travel', 'office', 'kids', 'premium', 'clearance', 'bundle']
+
+QUERIES = [
+    {'query': 'phone'},
+    {'query': 'deluxe kettle', 'max_price': 100.0},
+    {'query': 'mod-42'},
+    {'query': '', 'category': 'category-7', 'min_price': 10.0, 'max_price': 12.0},
+    {'query': 'eco', 'category': 'category-3'},
+    {'query': 'bestseller', 'min_price': 990.0},
+]
+
+
+def make_products(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        Product(
+            id=i,
+            name=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} mod-{rng.randrange(1000)}',
+            price=round(rng.uniform(1, 1000), 2),
+            category=rng.choice(CATEGORIES),
+            stock=rng.randrange(500),
+            tags=rng.sample(TAGS, 3),
+        )
+        for i in range(count)
+    ]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(count=1_000_000):
+    products = make_products(count)
+    catalog, build_seconds = timed(ProductCatalog, products)
+    print(f"Built catalog of {count:,} products in {build_seconds:.1f}s\n")
+
+    print(f"{'filters':<62} {'matches':>8} {'scan ms':>9} {'index ms':>9}")
+    for filters in QUERIES:
+        expected, scan_seconds = timed(search_products, products, **filters)
+        found, index_seconds = timed(catalog.search, **filters)
+        assert found == expected, f"results differ for {filters}"
+        label = ', '.join(f'{key}={value!r}' for key, value in filters.items())
+        print(f"{label:<62} {len(found):>8} {scan_seconds * 1000:>9.1f} "
+              f"{index_seconds * 1000:>9.2f}")
+
+    extra = make_products(1000, seed=7)
+    for i, product in enumerate(extra):
+        product.id = count + i
+    _, add_seconds = timed(lambda: [catalog.add(p) for p in extra])
+    for product in extra:
+        product.price = round(product.price / 2, 2)
+    _, update_seconds = timed(lambda: [catalog.update(p) for p in extra])
+    _, remove_seconds = timed(lambda: [catalog.remove(p.id) for p in extra])
+    # Seconds for 1000 operations == milliseconds per operation
+    print(f"\nPer product (average of 1000): add {add_seconds:.3f} ms, "
+          f"update {update_seconds:.3f} ms, remove {remove_seconds:.3f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,76 @@
+"""
+Columnar Store Benchmark
+========================
+Compares the list-based functions in original_python.py with their
+ProductColumns equivalents on generated products, checking that both
+give the same products in the same order:
+
+- find_top_products         vs  top_by_price (argpartition)
+- price range + category    vs  combined boolean masks
+- group_by_category         vs  group_rows_by_category (bincount)
+
+Columnar timings exclude converting rows back to Products; the time to
+build the columns is reported separately.
+
+Run from the 10-code-translation folder:
+    python benchmarks/bench_columns.py [products]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_catalog import make_products  # noqa: E402
+from original_python import find_top_products, group_by_category  # noqa: E402
+from product_columns import ProductColumns  # noqa: E402
+
+
+def timed(func, *args, repeat=3):
+    """Best of `repeat` runs: (result, seconds)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def filter_list(products):
+    return [p for p in products
+            if 100.0 <= p.price <= 200.0 and p.category == 'category-3']
+
+
+def main(count=1_000_000):
+    products = make_products(count)
+    columns, build_seconds = timed(ProductColumns.from_products, products, repeat=1)
+    print(f"Built columns for {count:,} products in {build_seconds:.2f}s\n")
+
+    cases = [
+        ('top 5 by price',
+         lambda: find_top_products(products, 5),
+         lambda: columns.top_by_price(5),
+         lambda rows: columns.to_products(rows)),
+        ('price range + category',
+         lambda: filter_list(products),
+         lambda: columns.price_between(100.0, 200.0) & columns.in_category('category-3'),
+         lambda mask: columns.to_products(mask)),
+        ('group by category',
+         lambda: group_by_category(products),
+         lambda: columns.group_rows_by_category(),
+         lambda groups: {name: columns.to_products(rows) for name, rows in groups.items()}),
+    ]
+
+    print(f"{'operation':<24} {'list ms':>9} {'columns ms':>11} {'speedup':>8}")
+    for name, list_func, columns_func, to_products in cases:
+        expected, list_seconds = timed(list_func)
+        result, columns_seconds = timed(columns_func)
+        assert to_products(result) == expected, f"results differ for {name}"
+        print(f"{name:<24} {list_seconds * 1000:>9.1f} {columns_seconds * 1000:>11.2f} "
+              f"{list_seconds / columns_seconds:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,81 @@
+"""
+Order Statistics Benchmark
+==========================
+Compares calculate_user_statistics (a scan of all orders per user) with
+OrderIndex on generated orders, checking that both return the same
+statistics.
+
+Scanning for every user takes close to an hour at the default size, so it
+is timed for a sample of users and extrapolated.
+
+Run from the 10-code-translation folder:
+    python benchmarks/bench_orders.py [users] [orders]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_index import OrderIndex  # noqa: E402
+from original_python import Order, calculate_user_statistics  # noqa: E402
+
+SAMPLE_USERS = 20
+
+
+def make_orders(user_count, order_count, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    return [
+        Order(
+            id=i,
+            user_id=rng.randrange(user_count),
+            products=[(rng.randrange(1000), rng.randint(1, 3))],
+            total=round(rng.uniform(5, 500), 2),
+            status=rng.choice(['pending', 'shipped', 'delivered']),
+            created_at=start + timedelta(minutes=rng.randrange(500_000)),
+        )
+        for i in range(order_count)
+    ]
+
+
+def main(user_count=100_000, order_count=1_000_000):
+    orders = make_orders(user_count, order_count)
+    sample = random.Random(1).sample(range(user_count), SAMPLE_USERS)
+
+    start = time.perf_counter()
+    expected = {user_id: calculate_user_statistics(user_id, orders) for user_id in sample}
+    scan_per_user = (time.perf_counter() - start) / SAMPLE_USERS
+
+    start = time.perf_counter()
+    index = OrderIndex(orders)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    index.all_statistics()
+    all_seconds = time.perf_counter() - start
+
+    for user_id in sample:
+        assert index.statistics(user_id) == expected[user_id], user_id
+    assert index.statistics(-1) == calculate_user_statistics(-1, orders)
+
+    start = time.perf_counter()
+    extra = make_orders(user_count, 10_000, seed=7)
+    for order in extra:
+        index.add(order)
+    add_seconds = (time.perf_counter() - start) / len(extra)
+
+    print(f"{order_count:,} orders from {user_count:,} users\n")
+    print(f"calculate_user_statistics  {scan_per_user * 1000:>10.2f} ms per user, "
+          f"~{scan_per_user * user_count / 60:,.0f} min for all users")
+    print(f"OrderIndex build           {build_seconds:>10.2f} s (one pass)")
+    print(f"OrderIndex all users       {all_seconds:>10.2f} s "
+          f"({all_seconds / user_count * 1e6:.2f} us per user)")
+    print(f"OrderIndex.add             {add_seconds * 1e6:>10.2f} us per order")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,122 @@
+"""
+Top-N Benchmark
+===============
+Compares ways of getting the 5 most expensive products:
+
+- sorting the whole list vs top_n's bounded heap
+- loading a product file into a list vs streaming it through top_n
+  (time and peak memory measured with tracemalloc)
+- after each repricing: recomputing over the list vs TopNView.update
+
+Every method is checked against the sorted result.
+
+Run from the 10-code-translation folder:
+    python benchmarks/bench_top_n.py [products]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_catalog import make_products  # noqa: E402
+from original_python import Product  # noqa: E402
+from top_n import TopNView, top_n  # noqa: E402
+
+N = 5
+
+
+def by_price(product):
+    return product.price
+
+
+def sort_top(products):
+    return sorted(products, key=by_price, reverse=True)[:N]
+
+
+def read_products(path):
+    """Stream products from an NDJSON file, one line at a time."""
+    with open(path) as f:
+        for line in f:
+            yield Product(**json.loads(line))
+
+
+def measured(func, *args):
+    """Run func; return (result, seconds, peak MB allocated)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main(count=1_000_000):
+    products = make_products(count)
+    expected = sort_top(products)
+
+    print(f"In memory, {count:,} products")
+    start = time.perf_counter()
+    sort_top(products)
+    sort_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    assert top_n(products, N, key=by_price) == expected
+    heap_seconds = time.perf_counter() - start
+    print(f"  sort + slice       {sort_seconds * 1000:>9.1f} ms")
+    print(f"  top_n (heap)       {heap_seconds * 1000:>9.1f} ms\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'products.ndjson')
+        with open(path, 'w') as f:
+            for product in products:
+                f.write(json.dumps(asdict(product)) + '\n')
+        file_mb = os.path.getsize(path) / 1e6
+
+        def load_then_sort():
+            return sort_top(list(read_products(path)))
+
+        def stream():
+            return top_n(read_products(path), N, key=by_price)
+
+        print(f"From a {file_mb:.0f} MB file (traced, so slower than above)")
+        for name, func in (('load + sort', load_then_sort), ('stream + top_n', stream)):
+            result, seconds, peak_mb = measured(func)
+            assert result == expected, name
+            print(f"  {name:<18} {seconds:>9.2f} s   peak {peak_mb:>8.2f} MB")
+
+    rng = random.Random(1)
+    view = TopNView(N, products)
+    assert view.top() == expected
+    changes = 1000
+    start = time.perf_counter()
+    for _ in range(changes):
+        product = products[rng.randrange(count)]
+        product.price = round(rng.uniform(1, 1100), 2)
+        view.update(product)
+        view.top()
+    view_seconds = (time.perf_counter() - start) / changes
+
+    recompute_runs = 5
+    start = time.perf_counter()
+    for _ in range(recompute_runs):
+        product = products[rng.randrange(count)]
+        product.price = round(rng.uniform(1, 1100), 2)
+        view.update(product)
+        top_n(products, N, key=by_price)
+    recompute_seconds = (time.perf_counter() - start) / recompute_runs
+    assert view.top() == sort_top(products)
+
+    print("\nPer repricing, keeping the top 5 current")
+    print(f"  recompute (top_n)  {recompute_seconds * 1000:>9.3f} ms")
+    print(f"  TopNView.update    {view_seconds * 1000:>9.3f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,102 @@
+"""
+User Codec Benchmark
+====================
+Writes and reads generated users as an NDJSON file and reports records/s
+and MB/s for:
+
+- user_to_json / user_from_json, one call per user (the baseline)
+- UserCodec with the stdlib json backend
+- UserCodec with the orjson backend, if orjson is installed
+
+Every method's output is read back and compared with the input users.
+
+Run from the 10-code-translation folder:
+    python benchmarks/bench_user_codec.py [users]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from original_python import User, user_from_json, user_to_json  # noqa: E402
+from user_codec import JSON_BACKENDS, UserCodec  # noqa: E402
+
+
+def make_users(count, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    return [
+        User(
+            id=i,
+            username=f'user_{i}',
+            email=f'user{i}@example.com',
+            created_at=start + timedelta(seconds=rng.randrange(10**8),
+                                         microseconds=rng.randrange(10**6)),
+            is_active=rng.random() < 0.9,
+            role=rng.choice(['user', 'user', 'user', 'admin']),
+        )
+        for i in range(count)
+    ]
+
+
+def write_baseline(users, path):
+    with open(path, 'w') as f:
+        for user in users:
+            f.write(user_to_json(user) + '\n')
+
+
+def read_baseline(path):
+    with open(path) as f:
+        return [user_from_json(line) for line in f]
+
+
+def codec_methods(backend):
+    codec = UserCodec(backend)
+
+    def write(users, path):
+        with open(path, 'wb') as f:
+            codec.write(users, f)
+
+    def read(path):
+        with open(path, 'rb') as f:
+            return list(codec.read(f))
+    return write, read
+
+
+def main(count=1_000_000):
+    users = make_users(count)
+    methods = [('per-call json', write_baseline, read_baseline)]
+    for backend in JSON_BACKENDS:
+        try:
+            methods.append((f'UserCodec {backend}',) + codec_methods(backend))
+        except ImportError:
+            print(f"({backend} is not installed; skipped)")
+
+    print(f"{count:,} users\n")
+    print(f"{'method':<18} {'write rec/s':>12} {'write MB/s':>11} "
+          f"{'read rec/s':>12} {'read MB/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'users.ndjson')
+        for name, write, read in methods:
+            start = time.perf_counter()
+            write(users, path)
+            write_seconds = time.perf_counter() - start
+            megabytes = os.path.getsize(path) / 1e6
+
+            start = time.perf_counter()
+            loaded = read(path)
+            read_seconds = time.perf_counter() - start
+            assert loaded == users, name
+            del loaded
+
+            print(f"{name:<18} {count / write_seconds:>12,.0f} {megabytes / write_seconds:>11.1f} "
+                  f"{count / read_seconds:>12,.0f} {megabytes / read_seconds:>10.1f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
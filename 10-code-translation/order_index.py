@@ -0,0 +1,99 @@
+"""
+Order Index
+===========
+Per-user order statistics without rescanning every order.
+
+`calculate_user_statistics` calls `fetch_user_orders`, which scans all
+orders, and then walks the user's orders three more times; computing
+statistics for every user is O(users x orders). OrderIndex reads each
+order once, groups it under its user and updates that user's running
+count, total and first/last order time. `statistics(user_id)` then
+returns the same dict as `calculate_user_statistics` in O(1).
+
+Orders can keep arriving after the index is built; add them with
+`add`.
+
+Compare with the scanning version using benchmarks/bench_orders.py.
+
+EXERCISE:
+1. Ask Copilot Chat: "Why do running totals give the same total_spent as sum()?"
+2. Ask: "Translate OrderIndex to C# with a Dictionary of records"
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from original_python import Order
+
+
+class _UserTotals:
+    """Running statistics for one user's orders."""
+
+    __slots__ = ('orders', 'total_spent', 'first_order', 'last_order')
+
+    def __init__(self):
+        self.orders: List[Order] = []
+        self.total_spent = 0
+        self.first_order: Optional[datetime] = None
+        self.last_order: Optional[datetime] = None
+
+
+class OrderIndex:
+    """Orders grouped by user with running per-user statistics."""
+
+    def __init__(self, orders: Iterable[Order] = ()):
+        self._users: Dict[int, _UserTotals] = {}
+        self._order_count = 0
+        for order in orders:
+            self.add(order)
+
+    def __len__(self) -> int:
+        """Number of orders indexed."""
+        return self._order_count
+
+    def add(self, order: Order) -> None:
+        """Index a new order."""
+        totals = self._users.get(order.user_id)
+        if totals is None:
+            totals = self._users[order.user_id] = _UserTotals()
+        totals.orders.append(order)
+        # Added in the same order as sum() would add them, so the float
+        # result is identical
+        totals.total_spent += order.total
+        created_at = order.created_at
+        if totals.first_order is None or created_at < totals.first_order:
+            totals.first_order = created_at
+        if totals.last_order is None or created_at > totals.last_order:
+            totals.last_order = created_at
+        self._order_count += 1
+
+    def user_ids(self) -> List[int]:
+        """IDs of the users with at least one order."""
+        return list(self._users)
+
+    def orders_for(self, user_id: int) -> List[Order]:
+        """A user's orders in the order they were added, like fetch_user_orders."""
+        totals = self._users.get(user_id)
+        return list(totals.orders) if totals else []
+
+    def statistics(self, user_id: int) -> Dict:
+        """Statistics for a user's orders, like calculate_user_statistics."""
+        totals = self._users.get(user_id)
+        if totals is None:
+            return {
+                "total_orders": 0,
+                "total_spent": 0,
+                "average_order": 0,
+            }
+        count = len(totals.orders)
+        return {
+            "total_orders": count,
+            "total_spent": totals.total_spent,
+            "average_order": totals.total_spent / count,
+            "first_order": totals.first_order,
+            "last_order": totals.last_order,
+        }
+
+    def all_statistics(self) -> Dict[int, Dict]:
+        """Statistics for every user with orders, keyed by user ID."""
+        return {user_id: self.statistics(user_id) for user_id in self._users}
@@ -0,0 +1,269 @@
+"""
+Product Catalog
+===============
+An indexed version of `search_products` from original_python.py.
+
+`search_products` lowercases every name and tag and copies the list once
+per filter on every call. ProductCatalog builds its indexes once and
+answers the same query/category/min_price/max_price filters by
+intersecting them:
+
+- Token index: every word of a product's name and tags (lowercased runs
+  of letters and digits) maps to the IDs of the products containing it.
+  A trigram index over the distinct words finds the words containing
+  a query word, so substring queries still match ("phon" finds "phone").
+- Category index: category -> product IDs.
+- Price index: prices kept sorted, so a price range is two bisections.
+
+The filter with the fewest candidates is walked and the others are
+checked per product; candidates are confirmed with the original
+substring test. Results are identical to `search_products` over the
+same products, in the same (insertion) order.
+
+Products can be added, updated and removed without rebuilding. The
+catalog indexes the values a product has when it is added: call
+`update` after changing a product in place.
+
+Compare with the linear scan using benchmarks/bench_catalog.py.
+
+EXERCISE:
+1. Ask Copilot Chat: "Translate ProductCatalog to TypeScript using Map and Set"
+2. Ask: "Which C# collections match bisect and set intersection here?"
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from original_python import Product
+
+
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def _words(text: str) -> List[str]:
+    """Split lowercased text into runs of letters and digits."""
+    return _WORD_PATTERN.findall(text)
+
+
+def _trigrams(word: str) -> Set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class _Entry(NamedTuple):
+    """What a product was indexed under, so it can be unindexed later."""
+    seq: int
+    name: str                # lowercased
+    tags: Tuple[str, ...]    # lowercased
+    words: frozenset
+    category: str
+    price: float
+
+
+class ProductCatalog:
+    """Products indexed by word, category and price."""
+
+    def __init__(self, products: Iterable[Product] = ()):
+        self._products: Dict[int, Product] = {}
+        self._entries: Dict[int, _Entry] = {}
+        self._word_ids: Dict[str, Set[int]] = {}       # word -> product IDs
+        self._gram_words: Dict[str, Set[str]] = {}     # trigram -> words
+        self._category_ids: Dict[str, Set[int]] = {}   # category -> product IDs
+        self._prices: List[float] = []                 # sorted
+        self._price_ids: List[int] = []                # product ID per price
+        self._next_seq = 0
+
+        for product in products:
+            if product.id in self._products:
+                raise ValueError(f"Duplicate product ID {product.id}")
+            self._index(product)
+        # One sort instead of an insertion per product
+        pairs = sorted((entry.price, product_id) for product_id, entry in self._entries.items())
+        self._prices = [price for price, _ in pairs]
+        self._price_ids = [product_id for _, product_id in pairs]
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._products
+
+    def get(self, product_id: int) -> Optional[Product]:
+        """Get a product by ID."""
+        return self._products.get(product_id)
+
+    def add(self, product: Product) -> None:
+        """Add a product to the catalog."""
+        if product.id in self._products:
+            raise ValueError(f"Duplicate product ID {product.id}")
+        entry = self._index(product)
+        i = bisect_right(self._prices, entry.price)
+        self._prices.insert(i, entry.price)
+        self._price_ids.insert(i, product.id)
+
+    def update(self, product: Product) -> bool:
+        """Re-index a product after its fields changed.
+
+        The product keeps its position in search results.
+        """
+        if product.id not in self._products:
+            return False
+        seq = self._entries[product.id].seq
+        self._unindex(product.id)
+        entry = self._index(product, seq)
+        i = bisect_right(self._prices, entry.price)
+        self._prices.insert(i, entry.price)
+        self._price_ids.insert(i, product.id)
+        return True
+
+    def remove(self, product_id: int) -> bool:
+        """Remove a product from the catalog."""
+        if product_id not in self._products:
+            return False
+        self._unindex(product_id)
+        return True
+
+    def _index(self, product: Product, seq: Optional[int] = None) -> _Entry:
+        """Add a product to every index except the price index."""
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        name = product.name.lower()
+        tags = tuple(tag.lower() for tag in product.tags)
+        words = frozenset(_words(name)).union(*(_words(tag) for tag in tags))
+        entry = _Entry(seq, name, tags, words, product.category, product.price)
+
+        self._products[product.id] = product
+        self._entries[product.id] = entry
+        for word in words:
+            ids = self._word_ids.get(word)
+            if ids is None:
+                ids = self._word_ids[word] = set()
+                for gram in _trigrams(word):
+                    self._gram_words.setdefault(gram, set()).add(word)
+            ids.add(product.id)
+        self._category_ids.setdefault(product.category, set()).add(product.id)
+        return entry
+
+    def _unindex(self, product_id: int) -> None:
+        """Remove a product from every index."""
+        del self._products[product_id]
+        entry = self._entries.pop(product_id)
+        for word in entry.words:
+            ids = self._word_ids[word]
+            ids.discard(product_id)
+            if not ids:
+                del self._word_ids[word]
+                for gram in _trigrams(word):
+                    words = self._gram_words[gram]
+                    words.discard(word)
+                    if not words:
+                        del self._gram_words[gram]
+        ids = self._category_ids[entry.category]
+        ids.discard(product_id)
+        if not ids:
+            del self._category_ids[entry.category]
+
+        i = bisect_left(self._prices, entry.price)
+        while self._price_ids[i] != product_id:
+            i += 1
+        del self._prices[i]
+        del self._price_ids[i]
+
+    def _words_containing(self, piece: str) -> Iterable[str]:
+        """Get the indexed words that contain `piece`."""
+        if len(piece) < 3:
+            return [word for word in self._word_ids if piece in word]
+        gram_sets = sorted((self._gram_words.get(g, set()) for g in _trigrams(piece)), key=len)
+        return [word for word in gram_sets[0] if piece in word]
+
+    def _query_lookups(self, query: str) -> Optional[List[Tuple[int, Set[str]]]]:
+        """Get (number of postings, matching words) per word of `query`.
+
+        Every word of a matching name or tag contains each word of the
+        query, so products with a match in every lookup are a superset
+        of the matches. Sorted most selective first. Returns None if the
+        query has no letters or digits to narrow by.
+        """
+        pieces = set(_words(query))
+        if not pieces:
+            return None
+        lookups = []
+        for piece in pieces:
+            words = set(self._words_containing(piece))
+            lookups.append((sum(len(self._word_ids[word]) for word in words), words))
+        lookups.sort(key=lambda lookup: lookup[0])
+        return lookups
+
+    def _query_candidates(self, lookups: List[Tuple[int, Set[str]]]) -> Set[int]:
+        """Intersect the products of each lookup."""
+        size, words = lookups[0]
+        result: Set[int] = set()
+        for word in words:
+            result |= self._word_ids[word]
+        for size, words in lookups[1:]:
+            if not result:
+                break
+            if size > len(result):
+                # Cheaper to check the few remaining candidates' words
+                entries = self._entries
+                result = {i for i in result if not words.isdisjoint(entries[i].words)}
+            else:
+                ids: Set[int] = set()
+                for word in words:
+                    ids |= self._word_ids[word]
+                result &= ids
+        return result
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[Product]:
+        """Search products with the same filters as `search_products`."""
+        query = query.lower() if query else ''
+
+        # Each usable index offers (number of candidates, candidate IDs)
+        sources: List[Tuple[int, Iterable[int]]] = []
+        if category:
+            ids = self._category_ids.get(category, set())
+            sources.append((len(ids), ids))
+        if min_price is not None or max_price is not None:
+            lo = 0 if min_price is None else bisect_left(self._prices, min_price)
+            hi = len(self._prices) if max_price is None else bisect_right(self._prices, max_price)
+            hi = max(lo, hi)
+            sources.append((hi - lo, self._price_ids[lo:hi]))
+        # Only collect the query's candidates if they could be the fewest;
+        # otherwise the substring check below filters them out anyway
+        query_ids: Optional[Set[int]] = None
+        lookups = self._query_lookups(query) if query else None
+        fewest = min((size for size, _ in sources), default=None)
+        if lookups is not None and (fewest is None or lookups[0][0] < fewest):
+            query_ids = self._query_candidates(lookups)
+            sources.append((len(query_ids), query_ids))
+
+        if not sources:
+            candidates: Iterable[int] = self._products
+        else:
+            candidates = min(sources, key=lambda source: source[0])[1]
+
+        entries = self._entries
+        matches = []
+        for product_id in candidates:
+            entry = entries[product_id]
+            if category and entry.category != category:
+                continue
+            if min_price is not None and entry.price < min_price:
+                continue
+            if max_price is not None and entry.price > max_price:
+                continue
+            if query_ids is not None and product_id not in query_ids:
+                continue
+            if query and not (query in entry.name or any(query in tag for tag in entry.tags)):
+                continue
+            matches.append((entry.seq, product_id))
+
+        matches.sort()
+        return [self._products[product_id] for _, product_id in matches]
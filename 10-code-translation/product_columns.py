@@ -0,0 +1,222 @@
+"""
+Columnar Product Store
+======================
+Products stored column by column in NumPy arrays, for filtering,
+ranking and grouping without a Python loop per product.
+
+`find_top_products`, price filters and `group_by_category` in
+original_python.py visit one Product object at a time. ProductColumns
+holds the same data as:
+
+- ids, prices and stock: one NumPy array each
+- categories: dictionary-encoded, an integer code per product plus the
+  list of distinct category names
+- tags: CSR layout, one flat array of tag codes plus an offsets array,
+  so product i's tags are tag_codes[tag_offsets[i]:tag_offsets[i + 1]]
+- names: a NumPy object array (only needed to rebuild Products)
+
+Filters return boolean masks that combine with & and |. top_by_price
+uses argpartition (O(N) instead of a full sort) and grouping uses
+bincount. Row numbers convert back to Products with `to_products`.
+
+NumPy is optional for the rest of this folder; this module needs it
+(`pip install numpy`).
+
+Compare with the list-based functions using benchmarks/bench_columns.py.
+
+EXERCISE:
+1. Ask Copilot Chat: "Explain how the CSR tag layout answers has_tag"
+2. Ask: "Translate top_by_price to C# using spans instead of NumPy"
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from original_python import Product
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by ProductColumns
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("ProductColumns needs NumPy: pip install numpy")
+
+
+class ProductColumns:
+    """Products stored as NumPy columns."""
+
+    def __init__(self, ids, names, prices, stock, category_codes, categories,
+                 tag_offsets, tag_codes, tags):
+        _require_numpy()
+        self.ids = ids
+        self.names = names
+        self.prices = prices
+        self.stock = stock
+        self.category_codes = category_codes
+        self.categories: List[str] = categories
+        self.tag_offsets = tag_offsets
+        self.tag_codes = tag_codes
+        self.tags: List[str] = tags
+        self._category_lookup = {name: code for code, name in enumerate(categories)}
+        self._tag_lookup = {name: code for code, name in enumerate(tags)}
+        # Owning row of each entry in tag_codes
+        self._tag_rows = np.repeat(np.arange(len(ids)), np.diff(tag_offsets))
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> 'ProductColumns':
+        """Build the columns from Product objects.
+
+        Category and tag codes are assigned in order of first appearance.
+        """
+        _require_numpy()
+        products = list(products)
+        count = len(products)
+        category_lookup: Dict[str, int] = {}
+        tag_lookup: Dict[str, int] = {}
+        category_codes = np.fromiter(
+            (category_lookup.setdefault(p.category, len(category_lookup)) for p in products),
+            dtype=np.int32, count=count
+        )
+        tag_counts = np.fromiter((len(p.tags) for p in products), dtype=np.int64, count=count)
+        tag_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(tag_counts, out=tag_offsets[1:])
+        tag_codes = np.fromiter(
+            (tag_lookup.setdefault(tag, len(tag_lookup)) for p in products for tag in p.tags),
+            dtype=np.int32, count=int(tag_offsets[-1])
+        )
+        names = np.empty(count, dtype=object)
+        names[:] = [p.name for p in products]
+        return cls(
+            ids=np.fromiter((p.id for p in products), dtype=np.int64, count=count),
+            names=names,
+            prices=np.fromiter((p.price for p in products), dtype=np.float64, count=count),
+            stock=np.fromiter((p.stock for p in products), dtype=np.int64, count=count),
+            category_codes=category_codes,
+            categories=list(category_lookup),
+            tag_offsets=tag_offsets,
+            tag_codes=tag_codes,
+            tags=list(tag_lookup),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_products(self, rows=None) -> List[Product]:
+        """Rebuild Product objects for all rows, row numbers or a mask."""
+        if rows is None:
+            rows = np.arange(len(self))
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64, copy=False)
+        starts = self.tag_offsets[rows].tolist()
+        ends = self.tag_offsets[rows + 1].tolist()
+        tag_codes = self.tag_codes.tolist() if len(rows) * 4 > len(self) else self.tag_codes
+        categories, tags = self.categories, self.tags
+        return [
+            Product(
+                id=product_id,
+                name=name,
+                price=price,
+                category=categories[code],
+                stock=stock,
+                tags=[tags[tag] for tag in tag_codes[start:end]],
+            )
+            for product_id, name, price, code, stock, start, end in zip(
+                self.ids[rows].tolist(), self.names[rows].tolist(),
+                self.prices[rows].tolist(), self.category_codes[rows].tolist(),
+                self.stock[rows].tolist(), starts, ends
+            )
+        ]
+
+    # -------------------------------------------------------------------------
+    # Filter masks
+    # -------------------------------------------------------------------------
+
+    def price_between(self, min_price: Optional[float] = None,
+                      max_price: Optional[float] = None):
+        """Mask of products with min_price <= price <= max_price."""
+        mask = np.ones(len(self), dtype=bool)
+        if min_price is not None:
+            mask &= self.prices >= min_price
+        if max_price is not None:
+            mask &= self.prices <= max_price
+        return mask
+
+    def in_category(self, category: str):
+        """Mask of products in `category`."""
+        code = self._category_lookup.get(category)
+        if code is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.category_codes == code
+
+    def has_tag(self, tag: str):
+        """Mask of products tagged with `tag` (exact match)."""
+        mask = np.zeros(len(self), dtype=bool)
+        code = self._tag_lookup.get(tag)
+        if code is not None:
+            mask[self._tag_rows[self.tag_codes == code]] = True
+        return mask
+
+    def in_stock(self, min_stock: int = 1):
+        """Mask of products with at least `min_stock` units."""
+        return self.stock >= min_stock
+
+    # -------------------------------------------------------------------------
+    # Ranking and grouping
+    # -------------------------------------------------------------------------
+
+    def top_by_price(self, n: int = 5, mask=None):
+        """Row numbers of the n most expensive products, highest first.
+
+        Matches find_top_products: equal prices keep their input order.
+        """
+        rows = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        if n <= 0 or len(rows) == 0:
+            return rows[:0]
+        prices = self.prices[rows]
+        if n < len(rows):
+            # The n-th highest price; everything above it is in, and the
+            # earliest rows priced exactly at it fill the remaining places
+            cutoff = prices[np.argpartition(-prices, n - 1)[n - 1]]
+            above = np.flatnonzero(prices > cutoff)
+            at = np.flatnonzero(prices == cutoff)[:n - len(above)]
+            picked = np.concatenate([above, at])
+            rows, prices = rows[picked], prices[picked]
+        # Sort by price descending, then by row number
+        return rows[np.lexsort((rows, -prices))]
+
+    def group_rows_by_category(self) -> Dict[str, 'np.ndarray']:
+        """Row numbers per category, like group_by_category.
+
+        Categories are in order of first appearance and rows keep their
+        input order, as in group_by_category.
+        """
+        codes = self.category_codes
+        if len(self.categories) <= np.iinfo(np.uint16).max:
+            # Stable sorts of 16-bit keys use radix sort: O(N)
+            codes = codes.astype(np.uint16)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(self.category_codes, minlength=len(self.categories))
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        return {
+            name: order[bounds[code]:bounds[code + 1]]
+            for code, name in enumerate(self.categories)
+            if counts[code]
+        }
+
+    def category_summary(self) -> Dict[str, Dict]:
+        """Product count, units in stock and average price per category."""
+        size = len(self.categories)
+        counts = np.bincount(self.category_codes, minlength=size)
+        stock = np.bincount(self.category_codes, weights=self.stock, minlength=size)
+        price_sums = np.bincount(self.category_codes, weights=self.prices, minlength=size)
+        return {
+            name: {
+                "products": int(counts[code]),
+                "stock": int(stock[code]),
+                "average_price": float(price_sums[code] / counts[code]),
+            }
+            for code, name in enumerate(self.categories)
+            if counts[code]
+        }
@@ -0,0 +1,206 @@
+"""
+Top-N Selection
+===============
+Find the N best items without sorting them all.
+
+`find_top_products` used to sort the whole product list to return five
+items. Selecting with a heap of size N is O(total x log N) time and
+O(N) memory, and works on any iterable, including generators that read
+products from disk one at a time:
+
+- top_n: the N items with the largest keys, in order. Equal keys keep
+  their input order, exactly like sorted(..., reverse=True)[:n].
+  `with_ties=True` also returns every item tied with the last one.
+- TopNView: a top-N that stays current while products are added,
+  repriced or removed, without re-sorting. Each change costs
+  O(N + log total).
+
+Compare with sorting using benchmarks/bench_top_n.py.
+
+EXERCISE:
+1. Ask Copilot Chat: "Why does TopNView keep the products outside the top N in a heap?"
+2. Ask: "Translate top_n to JavaScript; which part needs a hand-written heap?"
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional
+
+from original_python import Product
+
+
+def _price(product: Product) -> float:
+    return product.price
+
+
+def _identity(item):
+    return item
+
+
+def top_n(items: Iterable, n: int, key: Optional[Callable] = None,
+          with_ties: bool = False) -> List:
+    """Get the n items with the largest keys, largest first.
+
+    Reads `items` once, keeping at most n of them (plus ties) in memory.
+    Equal keys keep their input order. With `with_ties`, items tied with
+    the n-th are appended, so more than n items may be returned.
+    """
+    if not with_ties:
+        return heapq.nlargest(n, items, key=key)
+    if n <= 0:
+        return []
+    if key is None:
+        key = _identity
+
+    # Min-heap of (key, -position, item): heap[0] is the entry to drop
+    # next, the latest of the lowest keys. Positions are unique, so items
+    # themselves are never compared.
+    heap: list = []
+    ties: list = []  # entries outside the heap whose key equals heap[0]'s
+    for position, item in enumerate(items):
+        entry = (key(item), -position, item)
+        if len(heap) < n:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            dropped = heapq.heapreplace(heap, entry)
+            lowest = heap[0][0]
+            if ties and ties[0][0] != lowest:
+                ties.clear()
+            if dropped[0] == lowest:
+                ties.append(dropped)
+        elif entry[0] == heap[0][0]:
+            ties.append(entry)
+
+    ranked = sorted(heap, reverse=True)
+    ranked.extend(sorted(ties, reverse=True))
+    return [entry[2] for entry in ranked]
+
+
+class _Ranked:
+    """A product's place in a TopNView; `a < b` means a ranks above b."""
+
+    __slots__ = ('key', 'seq', 'product_id', 'product', 'in_top')
+
+    def __init__(self, key, seq, product):
+        self.key = key
+        self.seq = seq
+        self.product_id = product.id
+        self.product = product
+        self.in_top = False
+
+    def __lt__(self, other):
+        return self.key > other.key or (self.key == other.key and self.seq < other.seq)
+
+
+class TopNView:
+    """The top n products by a key (price by default), kept up to date.
+
+    The top n are kept sorted in a short list. Every other product waits
+    in a heap ordered best first, so when a top product is removed or
+    repriced downwards its replacement is one heap pop away. Outdated
+    heap entries are skipped when popped and purged once they outnumber
+    the live ones.
+    """
+
+    def __init__(self, n: int = 5, products: Iterable[Product] = (),
+                 key: Callable[[Product], object] = _price):
+        self._n = n
+        self._key = key
+        self._entries: Dict[int, _Ranked] = {}
+        self._next_seq = 0
+        self._stale = 0  # outdated entries still in the heap
+
+        for product in products:
+            if product.id in self._entries:
+                raise ValueError(f"Duplicate product ID {product.id}")
+            self._entries[product.id] = self._new_entry(product)
+        self._top: List[_Ranked] = heapq.nsmallest(n, self._entries.values())
+        for entry in self._top:
+            entry.in_top = True
+        self._rest: List[_Ranked] = [e for e in self._entries.values() if not e.in_top]
+        heapq.heapify(self._rest)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._entries
+
+    def top(self) -> List[Product]:
+        """Get the top products, best first, as find_top_products would."""
+        return [entry.product for entry in self._top]
+
+    def add(self, product: Product) -> None:
+        """Start tracking a product."""
+        if product.id in self._entries:
+            raise ValueError(f"Duplicate product ID {product.id}")
+        entry = self._new_entry(product)
+        self._entries[product.id] = entry
+        self._place(entry)
+
+    def update(self, product: Product) -> bool:
+        """Re-rank a product after its key (e.g. price) changed.
+
+        The product keeps its original position for breaking ties.
+        """
+        old = self._entries.get(product.id)
+        if old is None:
+            return False
+        entry = _Ranked(self._key(product), old.seq, product)
+        self._entries[product.id] = entry
+        self._discard(old)
+        self._place(entry)
+        return True
+
+    def remove(self, product_id: int) -> bool:
+        """Stop tracking a product."""
+        entry = self._entries.pop(product_id, None)
+        if entry is None:
+            return False
+        self._discard(entry)
+        self._refill()
+        return True
+
+    def _new_entry(self, product: Product) -> _Ranked:
+        entry = _Ranked(self._key(product), self._next_seq, product)
+        self._next_seq += 1
+        return entry
+
+    def _place(self, entry: _Ranked) -> None:
+        """Put a new entry in the top list or the heap."""
+        self._refill()
+        top = self._top
+        if len(top) < self._n:
+            insort(top, entry)
+            entry.in_top = True
+        elif top and entry < top[-1]:
+            insort(top, entry)
+            entry.in_top = True
+            demoted = top.pop()
+            demoted.in_top = False
+            heapq.heappush(self._rest, demoted)
+        else:
+            heapq.heappush(self._rest, entry)
+
+    def _discard(self, entry: _Ranked) -> None:
+        """Take an outdated entry out of the ranking."""
+        if entry.in_top:
+            del self._top[bisect_left(self._top, entry)]
+            entry.in_top = False
+            return
+        # Left in the heap and skipped later; purge once mostly stale
+        self._stale += 1
+        if self._stale > 64 and self._stale * 2 > len(self._rest):
+            self._rest = [e for e in self._rest if self._entries.get(e.product_id) is e]
+            heapq.heapify(self._rest)
+            self._stale = 0
+
+    def _refill(self) -> None:
+        """Move the best waiting products up until the top list is full."""
+        while len(self._top) < self._n and self._rest:
+            entry = heapq.heappop(self._rest)
+            if self._entries.get(entry.product_id) is not entry:
+                self._stale -= 1
+                continue
+            entry.in_top = True
+            self._top.append(entry)  # ranks below everything already there
@@ -3,6 +3,14 @@ Sample Flask Application
 ========================
 This is a sample application for practicing @workspace queries.
 
+The app is built by `create_app(config_name)`. Importing this module is
+cheap: Flask, SQLAlchemy and the service layer are imported when the
+first app is created, and the .env file is read at that point too. No
+database connection is opened until the first query. `from app import app`
+still works and creates the default app on first access.
+
+Measure cold-start cost with benchmarks/bench_startup.py.
+
 EXERCISE:
 Open Copilot Chat and ask:
 - "@workspace Explain the structure of this application"
@@ -10,115 +18,141 @@ Open Copilot Chat and ask:
 - "@workspace What dependencies does this project need?"
 """
 
-from flask import Flask, jsonify, request
-from models import User, db
-from services import UserService
-from config import Config
-
-app = Flask(__name__)
-app.config.from_object(Config)
-db.init_app(app)
-
-
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Health check endpoint."""
-    return jsonify({'status': 'healthy', 'version': '1.0.0'})
-
-
-@app.route('/api/users', methods=['GET'])
-def get_users():
-    """Get all users with optional filtering."""
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    
-    try:
-        users = UserService.get_all_users(page=page, per_page=per_page)
-        return jsonify({
-            'users': [user.to_dict() for user in users.items],
-            'total': users.total,
-            'pages': users.pages,
-            'current_page': users.page
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/api/users/<int:user_id>', methods=['GET'])
-def get_user(user_id):
-    """Get a specific user by ID."""
-    try:
-        user = UserService.get_user_by_id(user_id)
-        if user is None:
-            return jsonify({'error': 'User not found'}), 404
-        return jsonify(user.to_dict())
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/api/users', methods=['POST'])
-def create_user():
-    """Create a new user."""
-    data = request.get_json()
-    
-    if not data:
-        return jsonify({'error': 'No data provided'}), 400
-    
-    required_fields = ['username', 'email']
-    missing = [f for f in required_fields if f not in data]
-    if missing:
-        return jsonify({'error': f'Missing fields: {missing}'}), 400
-    
-    try:
-        user = UserService.create_user(
-            username=data['username'],
-            email=data['email'],
-            password=data.get('password', 'default123')
+_environment_loaded = False
+
+
+def load_environment():
+    """Load variables from a .env file into os.environ, once per process.
+
+    Call this before importing `config`; its settings read the
+    environment when the module is first imported.
+    """
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
+
+
+def create_app(config_name=None):
+    """Create and configure the Flask application.
+
+    `config_name` is a key of config.config ('development', 'testing' or
+    'production'); by default FLASK_ENV picks it, as in get_config().
+    """
+    load_environment()
+
+    from flask import Flask
+    from cache import create_cache, redis_client
+    from config import config, get_config
+    from database import configure_sqlite_pragmas, engine_options_from_config
+    from hashing import PasswordHasher, configure_password_hasher
+    from instrumentation import init_instrumentation
+    from models import db
+    from pagination import create_count_strategy
+    from ratelimit import (
+        ConcurrencyLimiter, create_client_key, create_rate_limiter, init_admission_control
+    )
+    from routes import api
+    from search_index import create_search_index
+    from serializers import configure_json_backend
+    from services import UserService
+
+    settings = config[config_name] if config_name else get_config()
+    app = Flask(__name__)
+    app.config.from_object(settings)
+    # Pool options follow the DB_POOL_* settings unless given outright
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options_from_config(app.config)
+
+    # Creating the engine does not connect; the pool connects on first use
+    db.init_app(app)
+    with app.app_context():
+        configure_sqlite_pragmas(
+            db.engine,
+            journal_mode=settings.SQLITE_JOURNAL_MODE,
+            synchronous=settings.SQLITE_SYNCHRONOUS
         )
-        return jsonify(user.to_dict()), 201
-    except ValueError as e:
-        return jsonify({'error': str(e)}), 400
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-@app.route('/api/users/<int:user_id>', methods=['PUT'])
-def update_user(user_id):
-    """Update an existing user."""
-    data = request.get_json()
-    
-    if not data:
-        return jsonify({'error': 'No data provided'}), 400
-    
-    try:
-        user = UserService.update_user(user_id, data)
-        if user is None:
-            return jsonify({'error': 'User not found'}), 404
-        return jsonify(user.to_dict())
-    except ValueError as e:
-        return jsonify({'error': str(e)}), 400
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-
-# TODO: Ask Copilot with @workspace:
-# "How would I add a DELETE endpoint for users?"
-
-
-@app.errorhandler(404)
-def not_found(error):
-    """Handle 404 errors."""
-    return jsonify({'error': 'Resource not found'}), 404
-
-
-@app.errorhandler(500)
-def internal_error(error):
-    """Handle 500 errors."""
-    db.session.rollback()
-    return jsonify({'error': 'Internal server error'}), 500
+        init_instrumentation(app, db.engine, settings.SLOW_QUERY_THRESHOLD_MS)
+
+    # Shared by the 'remote' cache and rate limit backends
+    remote_client = redis_client(settings.REDIS_URL) if settings.REDIS_URL else None
+
+    UserService.configure_cache(create_cache(
+        backend=settings.USER_CACHE_BACKEND,
+        max_size=settings.USER_CACHE_SIZE,
+        ttl_seconds=settings.USER_CACHE_TTL,
+        client=remote_client
+    ))
+    UserService.configure_count_strategy(create_count_strategy(
+        strategy=settings.USER_COUNT_STRATEGY,
+        ttl_seconds=settings.USER_COUNT_TTL,
+        resync_seconds=settings.USER_COUNT_RESYNC
+    ))
+    UserService.configure_search_index(create_search_index(
+        backend=settings.SEARCH_INDEX_BACKEND,
+        path=settings.SEARCH_INDEX_PATH
+    ))
+    # The worker pool itself is only started by the first hash
+    configure_password_hasher(PasswordHasher(
+        log_rounds=settings.BCRYPT_LOG_ROUNDS,
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING
+    ))
+    configure_json_backend(settings.JSON_BACKEND)
+
+    # Short-lived cache of rendered list pages, emptied on any user write
+    list_response_cache = create_cache(
+        backend=settings.RESPONSE_CACHE_BACKEND,
+        max_size=settings.RESPONSE_CACHE_SIZE,
+        ttl_seconds=settings.RESPONSE_CACHE_TTL,
+        client=remote_client,
+        prefix='responses:'
+    )
+    UserService.add_change_listener(app, list_response_cache.clear)
+    app.extensions['list_response_cache'] = list_response_cache
+
+    # Shed load before it reaches the database; health and metrics stay open
+    rate_limiter = create_rate_limiter(
+        backend=settings.RATE_LIMIT_BACKEND,
+        capacity=settings.RATE_LIMIT_CAPACITY,
+        refill_per_second=settings.RATE_LIMIT_REFILL_PER_SECOND,
+        client=remote_client
+    )
+    concurrency_limiter = ConcurrencyLimiter(
+        max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+        queue_timeout=settings.CONCURRENCY_QUEUE_TIMEOUT
+    )
+    init_admission_control(
+        app, rate_limiter, concurrency_limiter,
+        exempt_paths=('/api/health', '/api/metrics', '/metrics'),
+        key_func=create_client_key(settings.API_KEYS, settings.TRUSTED_PROXIES)
+    )
+    app.extensions['rate_limiter'] = rate_limiter
+    app.extensions['concurrency_limiter'] = concurrency_limiter
+
+    app.register_blueprint(api)
+    return app
+
+
+_default_app = None
+
+
+def __getattr__(name):
+    """Create the default app the first time `app.app` is used."""
+    global _default_app
+    if name == 'app':
+        if _default_app is None:
+            _default_app = create_app()
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == '__main__':
+    from migrations import upgrade
+    from models import db
+
+    app = create_app()
     with app.app_context():
-        db.create_all()
-    app.run(debug=Config.DEBUG, port=Config.PORT)
+        upgrade(db.engine)
+    app.run(debug=app.config['DEBUG'], port=app.config['PORT'])
@@ -0,0 +1,228 @@
+"""
+ASGI Application
+================
+Async serving mode for the user API, alongside the Flask app in app.py.
+
+Serves the core user endpoints from AsyncUserService on an async database
+driver, so waiting on the database never holds a worker thread. Run it
+with any ASGI server, for example:
+
+    uvicorn asgi:application --port 8000
+
+or `python asgi.py` if uvicorn is installed. The Flask app (`python
+app.py`) remains the full-featured, synchronous entry point;
+benchmarks/load_test.py compares the two.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:asgi.py How does this handle a request without a web framework?"
+- "@workspace Which endpoints are available in async mode?"
+"""
+
+import json
+import re
+from urllib.parse import parse_qs
+
+from app import load_environment
+
+# .env must be loaded before config reads the environment
+load_environment()
+
+from async_services import AsyncUserService, close_async_db, create_all, init_async_db  # noqa: E402
+from config import get_config  # noqa: E402
+from database import async_database_uri  # noqa: E402
+from hashing import HashingBusyError, PasswordHasher, configure_password_hasher  # noqa: E402
+from serializers import dumps  # noqa: E402
+
+
+settings = get_config()
+configure_password_hasher(PasswordHasher(
+    log_rounds=settings.BCRYPT_LOG_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+))
+
+
+class Request:
+    """The parts of an HTTP request the handlers need."""
+
+    def __init__(self, scope, body):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.args = {
+            key: values[-1]
+            for key, values in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()
+        }
+        self.body = body
+
+    def arg_int(self, name, default):
+        try:
+            return int(self.args.get(name, default))
+        except ValueError:
+            return default
+
+    def get_json(self):
+        if not self.body:
+            return None
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+def hashing_busy_response():
+    """Response returned when the password hashing pool is saturated."""
+    return 503, {'error': 'Server busy, try again later'}, [(b'retry-after', b'1')]
+
+
+async def health_check(request):
+    """Health check endpoint."""
+    return 200, {'status': 'healthy', 'version': '1.0.0', 'mode': 'asgi'}
+
+
+async def get_users(request):
+    """Get all users with pagination."""
+    page = request.arg_int('page', 1)
+    per_page = max(1, min(request.arg_int('per_page', settings.DEFAULT_PAGE_SIZE),
+                          settings.MAX_PAGE_SIZE))
+    users = await AsyncUserService.get_all_users(page=page, per_page=per_page)
+    return 200, {
+        'users': [user.to_dict() for user in users.items],
+        'total': users.total,
+        'pages': users.pages,
+        'current_page': users.page
+    }
+
+
+async def get_user(request, user_id):
+    """Get a specific user by ID."""
+    user = await AsyncUserService.get_user_by_id(int(user_id))
+    if user is None:
+        return 404, {'error': 'User not found'}
+    return 200, user.to_dict()
+
+
+async def create_user(request):
+    """Create a new user."""
+    data = request.get_json()
+    if not data:
+        return 400, {'error': 'No data provided'}
+
+    required_fields = ['username', 'email']
+    missing = [f for f in required_fields if f not in data]
+    if missing:
+        return 400, {'error': f'Missing fields: {missing}'}
+
+    try:
+        user = await AsyncUserService.create_user(
+            username=data['username'],
+            email=data['email'],
+            password=data.get('password', 'default123')
+        )
+        return 201, user.to_dict()
+    except ValueError as e:
+        return 400, {'error': str(e)}
+    except HashingBusyError:
+        return hashing_busy_response()
+
+
+async def update_user(request, user_id):
+    """Update an existing user."""
+    data = request.get_json()
+    if not data:
+        return 400, {'error': 'No data provided'}
+
+    try:
+        user = await AsyncUserService.update_user(int(user_id), data)
+        if user is None:
+            return 404, {'error': 'User not found'}
+        return 200, user.to_dict()
+    except ValueError as e:
+        return 400, {'error': str(e)}
+    except HashingBusyError:
+        return hashing_busy_response()
+
+
+ROUTES = [
+    ('GET', re.compile(r'^/api/health$'), health_check),
+    ('GET', re.compile(r'^/api/users$'), get_users),
+    ('POST', re.compile(r'^/api/users$'), create_user),
+    ('GET', re.compile(r'^/api/users/(\d+)$'), get_user),
+    ('PUT', re.compile(r'^/api/users/(\d+)$'), update_user),
+]
+
+
+async def dispatch(request):
+    """Find the handler for a request and run it.
+
+    Handlers return (status, payload) or (status, payload, extra headers).
+    """
+    path_matched = False
+    for method, pattern, handler in ROUTES:
+        match = pattern.match(request.path)
+        if match is None:
+            continue
+        path_matched = True
+        if method == request.method:
+            return await handler(request, *match.groups())
+    if path_matched:
+        return 405, {'error': 'Method not allowed'}
+    return 404, {'error': 'Resource not found'}
+
+
+async def _read_body(receive):
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            init_async_db(
+                settings.ASYNC_DATABASE_URI
+                or async_database_uri(settings.SQLALCHEMY_DATABASE_URI)
+            )
+            await create_all()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_async_db()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI entry point."""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    request = Request(scope, await _read_body(receive))
+    try:
+        status, payload, *extra = await dispatch(request)
+    except Exception as e:
+        status, payload, extra = 500, {'error': str(e)}, []
+
+    body = dumps(payload)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            *(extra[0] if extra else []),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run('asgi:application', host=settings.HOST, port=settings.PORT)
@@ -0,0 +1,184 @@
+"""
+Async Service Layer
+===================
+Async counterparts of the UserService methods, for the ASGI entry point.
+
+A synchronous worker holds a thread for the whole time a request waits on
+the database. These methods await an async SQLAlchemy engine instead
+(aiosqlite locally, asyncpg/aiomysql in production), so one process can
+keep thousands of slow requests in flight. Validation and error messages
+are shared with UserService; password hashing runs in a thread so the
+event loop is never blocked.
+
+The in-process user cache and change listeners belong to the Flask
+process and are not updated from here; run the async API as its own
+process (see asgi.py). The search index picks up these writes from the
+change log on its next search.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:async_services.py #file:services.py How do the sync and async services differ?"
+"""
+
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models import User
+from pagination import IndexPage
+from services import (
+    CONFLICT_MESSAGES, UserService, conflict_from_error, conflict_from_rows,
+    conflict_query
+)
+
+
+_engine = None
+_sessions = None
+
+
+def init_async_db(database_uri, **engine_options):
+    """Create the async engine and session factory."""
+    global _engine, _sessions
+    _engine = create_async_engine(database_uri, **engine_options)
+    _sessions = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+
+async def close_async_db():
+    """Dispose of the async engine's connections."""
+    global _engine, _sessions
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _sessions = None
+
+
+async def create_all():
+    """Create database tables through the async engine."""
+    async with _engine.begin() as conn:
+        await conn.run_sync(User.metadata.create_all)
+
+
+async def _conflicting_field(session, error, username=None, email=None, exclude_id=None):
+    """Async version of the service layer's IntegrityError-to-field mapping."""
+    field = conflict_from_error(error)
+    if field is not None:
+        return field
+    query = conflict_query(username, email, exclude_id)
+    if query is None:
+        return None
+    return conflict_from_rows(await session.execute(query), username, email)
+
+
+class AsyncUserService:
+    """Async service class for user operations."""
+    
+    @staticmethod
+    async def get_all_users(page=1, per_page=10):
+        """Get all active users with pagination."""
+        page = max(page, 1)
+        active = User.is_active == True  # noqa: E712
+        async with _sessions() as session:
+            total = await session.scalar(
+                select(func.count()).select_from(User).where(active)
+            )
+            result = await session.scalars(
+                select(User).where(active).order_by(User.id)
+                .limit(per_page).offset((page - 1) * per_page)
+            )
+            return IndexPage(list(result), total, page, per_page)
+    
+    @staticmethod
+    async def get_user_by_id(user_id):
+        """Get a user by their ID."""
+        async with _sessions() as session:
+            return await session.get(User, user_id)
+    
+    @staticmethod
+    async def get_user_by_email(email):
+        """Get a user by their email."""
+        async with _sessions() as session:
+            return await session.scalar(select(User).where(User.email == email))
+    
+    @staticmethod
+    async def get_user_by_username(username):
+        """Get a user by their username."""
+        async with _sessions() as session:
+            return await session.scalar(select(User).where(User.username == username))
+    
+    @staticmethod
+    async def create_user(username, email, password):
+        """Create a new user."""
+        is_valid, error = UserService.validate_username(username)
+        if not is_valid:
+            raise ValueError(error)
+        if not UserService.validate_email(email):
+            raise ValueError("Invalid email format")
+        
+        # Building a User hashes the password; keep that off the event loop
+        user = await asyncio.to_thread(User, username=username, email=email, password=password)
+        async with _sessions() as session:
+            session.add(user)
+            try:
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                field = await _conflicting_field(session, e, username=username, email=email)
+                raise ValueError(CONFLICT_MESSAGES.get(field, "Could not create user"))
+        return user
+    
+    @staticmethod
+    async def update_user(user_id, data):
+        """Update an existing user."""
+        async with _sessions() as session:
+            user = await session.get(User, user_id)
+            if not user:
+                return None
+            
+            if 'username' in data:
+                is_valid, error = UserService.validate_username(data['username'])
+                if not is_valid:
+                    raise ValueError(error)
+                user.username = data['username']
+            
+            if 'email' in data:
+                if not UserService.validate_email(data['email']):
+                    raise ValueError("Invalid email format")
+                user.email = data['email']
+            
+            if 'password' in data:
+                user.password_hash = await asyncio.to_thread(
+                    User.hash_password, data['password']
+                )
+            
+            if 'is_active' in data:
+                user.is_active = data['is_active']
+            
+            try:
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                field = await _conflicting_field(
+                    session, e,
+                    username=data.get('username'),
+                    email=data.get('email'),
+                    exclude_id=user_id
+                )
+                raise ValueError(CONFLICT_MESSAGES.get(field, "Could not update user"))
+            return user
+    
+    @staticmethod
+    async def delete_user(user_id, soft_delete=True):
+        """Delete a user (soft delete by default)."""
+        async with _sessions() as session:
+            user = await session.get(User, user_id)
+            if not user:
+                return False
+            if soft_delete:
+                user.is_active = False
+            else:
+                await session.delete(user)
+            await session.commit()
+            return True
@@ -0,0 +1,63 @@
+"""
+Listing Count Benchmark
+=======================
+Compares the cost of one page of GET /api/users-style listing under each
+total-count strategy ('exact', 'cached', 'counter') as the users table
+grows.
+
+With 'exact' every page runs COUNT(*) over the active users, so page time
+grows with the table. 'cached' and 'counter' count at most once per TTL
+or resync period, so page time stays flat.
+
+Run from the 14-workspace-context folder:
+    python benchmarks/bench_counts.py [max_users]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DEBUG', 'false')
+
+from app import create_app  # noqa: E402
+from models import User, db  # noqa: E402
+from pagination import COUNT_STRATEGIES, create_count_strategy  # noqa: E402
+from services import UserService  # noqa: E402
+
+
+def add_users(start, stop):
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'user_{i}', 'email': f'user{i}@example.com',
+         'password_hash': 'x', 'is_active': i % 10 != 0}
+        for i in range(start, stop)
+    ])
+    db.session.commit()
+
+
+def page_ms(pages=200):
+    start = time.perf_counter()
+    for page in range(1, pages + 1):
+        UserService.get_all_users(page=page % 20 + 1, per_page=20)
+    return (time.perf_counter() - start) / pages * 1000
+
+
+def main(max_users=200000):
+    app = create_app('testing')
+    sizes = [size for size in (1000, 10000, 100000, 1000000) if size <= max_users]
+    print(f"{'users':>9} " + ' '.join(f"{name + ' ms':>11}" for name in COUNT_STRATEGIES))
+    with app.app_context():
+        db.create_all()
+        loaded = 0
+        for size in sizes:
+            add_users(loaded, size)
+            loaded = size
+            timings = []
+            for name in COUNT_STRATEGIES:
+                UserService.configure_count_strategy(create_count_strategy(name))
+                timings.append(page_ms())
+            print(f"{size:>9} " + ' '.join(f"{ms:>11.3f}" for ms in timings))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
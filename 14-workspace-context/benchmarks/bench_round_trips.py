@@ -0,0 +1,100 @@
+"""
+Round-Trip Benchmark
+====================
+Counts SQL statements per user creation for the old pre-check path and the
+current optimistic path.
+
+The old path ran two SELECTs (username, then email) before every INSERT.
+The current path only INSERTs and maps a unique-constraint violation to
+the conflicting field, so a conflict costs at most one extra query.
+
+Every user write also inserts a row into the user change log, in the
+same transaction. Those inserts are reported in their own column, so the
+queries/create column shows only the statements the uniqueness checks
+cost: 3 before, 1 after.
+
+The user cache is disabled so every lookup reaches the database.
+
+Run from the 14-workspace-context folder:
+    python benchmarks/bench_round_trips.py [count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DEBUG', 'false')
+
+from app import create_app  # noqa: E402
+from cache import NullCache  # noqa: E402
+from hashing import PasswordHasher, configure_password_hasher  # noqa: E402
+from models import User, db  # noqa: E402
+from query_counter import count_queries  # noqa: E402
+from services import UserService  # noqa: E402
+
+
+def legacy_create_user(username, email, password):
+    """The previous create path: two uniqueness SELECTs, then the INSERT."""
+    if User.query.filter_by(username=username).first():
+        raise ValueError("Username already exists")
+    if User.query.filter_by(email=email).first():
+        raise ValueError("Email already exists")
+    user = User(username=username, email=email, password=password)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def split_change_log(statements):
+    """Split statements into (change log inserts, everything else) counts."""
+    log_writes = sum(1 for s in statements if s.lstrip().startswith('INSERT INTO user_changes'))
+    return log_writes, len(statements) - log_writes
+
+
+def measure(create_user, prefix, count):
+    """Create `count` users, then retry each once; return per-call stats."""
+    with count_queries(db.engine) as created:
+        start = time.perf_counter()
+        for i in range(count):
+            create_user(f'{prefix}{i}', f'{prefix}{i}@example.com', 'password')
+        create_seconds = time.perf_counter() - start
+
+    with count_queries(db.engine) as conflicts:
+        for i in range(count):
+            try:
+                create_user(f'{prefix}{i}', f'other_{prefix}{i}@example.com', 'password')
+            except ValueError:
+                pass
+
+    log_writes, queries = split_change_log(created.statements)
+    return {
+        'queries_per_create': queries / count,
+        'log_writes_per_create': log_writes / count,
+        'queries_per_conflict': conflicts.count / count,
+        'creates_per_second': count / create_seconds,
+    }
+
+
+def main(count=500):
+    app = create_app('testing')
+    configure_password_hasher(PasswordHasher(log_rounds=4, max_workers=0))
+    UserService.configure_cache(NullCache())
+
+    with app.app_context():
+        db.create_all()
+        results = {
+            'pre-check (before)': measure(legacy_create_user, 'legacy', count),
+            'optimistic (after)': measure(UserService.create_user, 'optimistic', count),
+        }
+
+    print(f"{'path':<20} {'queries/create':>15} {'log writes/create':>18} "
+          f"{'queries/conflict':>17} {'creates/s':>10}")
+    for name, stats in results.items():
+        print(f"{name:<20} {stats['queries_per_create']:>15.2f} "
+              f"{stats['log_writes_per_create']:>18.2f} "
+              f"{stats['queries_per_conflict']:>17.2f} {stats['creates_per_second']:>10.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,123 @@
+"""
+Server Throughput Benchmark
+===========================
+Compares the development server (`python app.py`) with the production
+server (`python serve.py`) on the same database and request mix.
+
+Both run with the production configuration against a temporary SQLite
+file seeded with users, with the per-client rate limit off. Each server
+is started on a free port, load-tested with load_test.run_load, and
+stopped again.
+
+The development server handles every request in one process (one thread
+per request, all sharing the GIL). serve.py forks WEB_WORKERS processes,
+so throughput should scale with the CPU cores available.
+
+Run from the 14-workspace-context folder:
+    python benchmarks/bench_server.py [requests] [concurrency]
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import run_load  # noqa: E402
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = [
+    ('dev', [sys.executable, 'app.py']),
+    ('serve.py', [sys.executable, 'serve.py']),
+]
+
+PATHS = ['/api/users?per_page=20', '/api/users/1']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            urllib.request.urlopen(url + '/api/health', timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start in {timeout}s")
+
+
+def seed(db_path, count=1000):
+    """Add users once the first server has created the schema."""
+    with sqlite3.connect(db_path) as conn:
+        if conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]:
+            return
+        conn.executemany(
+            'INSERT INTO users (username, email, password_hash, is_active, '
+            'created_at, updated_at) VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)',
+            [(f'user_{i}', f'user{i}@example.com', 'x') for i in range(count)]
+        )
+
+
+def measure(name, command, env, total_requests, concurrency):
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+    process = subprocess.Popen(
+        command, cwd=APP_DIR, env=dict(env, PORT=str(port)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(url, process)
+        seed(env['DATABASE_PATH'])
+        results = {}
+        for path in PATHS:
+            # Warm up caches and connections before measuring
+            asyncio.run(run_load(url, path, concurrency, concurrency * 2))
+            results[path] = asyncio.run(run_load(url, path, concurrency, total_requests))
+        return results
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+
+def main(total_requests=5000, concurrency=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        env = dict(
+            os.environ,
+            FLASK_ENV='production',
+            DEBUG='false',
+            HOST='127.0.0.1',
+            DATABASE_URL=f'sqlite:///{db_path}',
+            DATABASE_PATH=db_path,
+            RATE_LIMIT_BACKEND='none',
+            WEB_PIDFILE=os.path.join(tmp, 'gunicorn.pid'),
+        )
+        env.setdefault('SECRET_KEY', 'bench')
+
+        print(f"{'server':<10} {'path':<24} {'errors':>7} {'req/s':>9} "
+              f"{'p50 ms':>8} {'p99 ms':>8}")
+        for name, command in SERVERS:
+            for path, stats in measure(name, command, env, total_requests, concurrency).items():
+                print(f"{name:<10} {path:<24} {stats['errors']:>7} {stats['rps']:>9.0f} "
+                      f"{stats.get('p50', 0) * 1000:>8.1f} {stats.get('p99', 0) * 1000:>8.1f}")
+    print(f"\n(serve.py workers: WEB_WORKERS, default 2 x {os.cpu_count()} cores + 1)")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
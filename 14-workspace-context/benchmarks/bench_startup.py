@@ -0,0 +1,65 @@
+"""
+Startup Benchmark
+=================
+Measures cold-start cost: importing the app module, building the app with
+create_app(), and serving the first request.
+
+Each run starts a fresh interpreter, so nothing is cached in memory
+(the OS file cache still is). The medians over all runs are reported.
+
+Run from the 14-workspace-context folder:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter and prints its timings as JSON
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app('testing')
+created = time.perf_counter()
+from models import db
+with application.app_context():
+    db.create_all()
+ready = time.perf_counter()
+response = application.test_client().get('/api/users')
+done = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    'import app': imported - start,
+    'create_app()': created - imported,
+    'first request': done - ready,
+    'import to first response': done - start - (ready - created),
+}))
+"""
+
+
+def run_once():
+    env = dict(os.environ, DEBUG='false')
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD], cwd=APP_DIR, env=env,
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs=10):
+    samples = [run_once() for _ in range(runs)]
+    print(f"{'phase':<26} {'median ms':>10} {'min ms':>8}")
+    for phase in samples[0]:
+        values = [sample[phase] * 1000 for sample in samples]
+        print(f"{phase:<26} {statistics.median(values):>10.1f} {min(values):>8.1f}")
+    print("\n(create_all is excluded: a real deployment migrates separately)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
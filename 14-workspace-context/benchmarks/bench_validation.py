@@ -0,0 +1,77 @@
+"""
+Validation Benchmark
+====================
+Measures validations per second for the shared validators against the
+previous inline `re.match` versions, plus batch validation with
+validate_many.
+
+No database or app is needed. Run from the 14-workspace-context folder:
+    python benchmarks/bench_validation.py [count]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validation import validate_email, validate_many, validate_username  # noqa: E402
+
+
+def legacy_validate_email(email):
+    """The previous validator: pattern string looked up on every call."""
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return bool(re.match(pattern, email))
+
+
+def legacy_validate_username(username):
+    if len(username) < 3:
+        return False, "Username must be at least 3 characters"
+    if len(username) > 80:
+        return False, "Username must be less than 80 characters"
+    if not re.match(r'^[a-zA-Z0-9_]+$', username):
+        return False, "Username can only contain letters, numbers, and underscores"
+    return True, None
+
+
+def make_records(count):
+    """Mostly valid records, with every tenth one broken."""
+    records = []
+    for i in range(count):
+        if i % 10 == 9:
+            records.append({'username': f'bad user {i}', 'email': f'user{i}@example'})
+        else:
+            records.append({'username': f'user_{i}', 'email': f'user{i}@example.com'})
+    return records
+
+
+def rate(func, values):
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    elapsed = time.perf_counter() - start
+    return len(values) / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    records = make_records(count)
+    emails = [r['email'] for r in records]
+    usernames = [r['username'] for r in records]
+
+    print(f"{'benchmark':<26} {'validations/s':>14}")
+    print(f"{'email (legacy)':<26} {rate(legacy_validate_email, emails):>14,.0f}")
+    print(f"{'email (compiled)':<26} {rate(validate_email, emails):>14,.0f}")
+    print(f"{'username (legacy)':<26} {rate(legacy_validate_username, usernames):>14,.0f}")
+    print(f"{'username (compiled)':<26} {rate(validate_username, usernames):>14,.0f}")
+
+    start = time.perf_counter()
+    errors = validate_many(records)
+    elapsed = time.perf_counter() - start
+    print(f"{'validate_many (records)':<26} {count / elapsed:>14,.0f}")
+    print(f"\n{sum(e is not None for e in errors)} of {count} records rejected")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Query Plan Check
+================
+Fails (exit status 1) if any hot endpoint's queries scan a whole table.
+
+Seeds a database with active and soft-deleted users and their posts,
+brings the schema up to date with migrations.upgrade(), then requests
+the listing, cursor, posts and change feed endpoints under
+assert_no_full_scans. test_query_plans.py runs the same requests under
+pytest; this script prints a per-request report.
+
+Run from the 14-workspace-context folder:
+    python benchmarks/check_query_plans.py [users]
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DEBUG', 'false')
+
+from app import create_app  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from models import Post, User, db  # noqa: E402
+from query_plans import assert_no_full_scans  # noqa: E402
+
+CHECKED_TABLES = {'users', 'posts', 'user_changes'}
+
+HOT_REQUESTS = [
+    '/api/users?page=3&per_page=20',
+    '/api/users?page=2&fields=id,username',
+    '/api/users?mode=cursor&per_page=20',
+    '/api/users?mode=cursor&order_by=created_at&include_total=true',
+    '/api/users?include=posts_count,recent_posts',
+    '/api/users/5/posts?page=2',
+    '/api/users/changes?since=10&limit=50',
+]
+
+
+def seed(user_count):
+    """Insert users (every fifth soft-deleted) and three posts each."""
+    start = datetime.utcnow() - timedelta(days=1)
+    db.session.execute(User.__table__.insert(), [
+        {
+            'username': f'user_{i}',
+            'email': f'user{i}@example.com',
+            'password_hash': 'x',
+            'is_active': i % 5 != 0,
+            'created_at': start + timedelta(seconds=i),
+            'updated_at': start + timedelta(seconds=i),
+        }
+        for i in range(1, user_count + 1)
+    ])
+    db.session.execute(Post.__table__.insert(), [
+        {
+            'title': f'Post {n}',
+            'content': 'Content',
+            'user_id': i,
+            'created_at': start + timedelta(seconds=i, minutes=n),
+        }
+        for i in range(1, user_count + 1) for n in range(3)
+    ])
+    db.session.commit()
+    # Let the planner see realistic table statistics
+    if db.engine.dialect.name in ('sqlite', 'postgresql'):
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+
+
+def main(user_count=2000):
+    app = create_app('testing')
+    client = app.test_client()
+    failures = 0
+    with app.app_context():
+        upgrade(db.engine)
+        seed(user_count)
+        # A cursor for the second keyset page
+        first = client.get('/api/users?mode=cursor&per_page=20').get_json()
+        requests = HOT_REQUESTS + [f'/api/users?after={first["next"]}&per_page=20']
+
+        for path in requests:
+            try:
+                with assert_no_full_scans(db.engine, tables=CHECKED_TABLES):
+                    response = client.get(path)
+                status = 'ok' if response.status_code == 200 else response.status_code
+                print(f"{'PASS':<5} {path} ({status})")
+            except AssertionError as e:
+                failures += 1
+                print(f"{'FAIL':<5} {path}\n{e}")
+
+    print(f"\n{len(requests) - failures} of {len(requests)} hot requests use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
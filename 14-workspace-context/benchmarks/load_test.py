@@ -0,0 +1,148 @@
+"""
+Load Test Harness
+=================
+Drives many concurrent HTTP/1.1 keep-alive clients against one or more
+running servers and reports throughput and latency percentiles.
+
+Use it to compare the synchronous Flask app with the async ASGI app:
+
+    python app.py                          # WSGI, port 5000
+    PORT=8000 python asgi.py               # ASGI, port 8000
+    python benchmarks/load_test.py \
+        --target wsgi=http://127.0.0.1:5000 \
+        --target asgi=http://127.0.0.1:8000 \
+        --path /api/users/1 --concurrency 500 --requests 20000
+
+Every request comes from one client address, so turn off the per-client
+rate limit on the servers under test (RATE_LIMIT_BACKEND=none), or the
+run measures 429 responses.
+
+`--think-time` makes each client pause between requests while keeping its
+connection open, which simulates many slow clients.
+
+No third-party packages are needed; the client is built on asyncio streams.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def _read_response(reader):
+    """Read one HTTP response; return its status and whether to keep the connection."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed")
+    version, status = status_line.split()[:2]
+    status = int(status)
+    keep_alive = version == b'HTTP/1.1'
+    content_length = 0
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            content_length = int(value.strip())
+        elif name == 'transfer-encoding' and 'chunked' in value.lower():
+            chunked = True
+        elif name == 'connection':
+            keep_alive = value.strip().lower() == 'keep-alive'
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif content_length:
+        await reader.readexactly(content_length)
+    return status, keep_alive
+
+
+async def _client(host, port, path, count, think_time, latencies, errors):
+    """One keep-alive connection issuing `count` GET requests."""
+    request = (f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n'
+               f'Connection: keep-alive\r\n\r\n').encode('latin-1')
+    reader = writer = None
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+            if status >= 400:
+                errors.append(status)
+            else:
+                latencies.append(time.perf_counter() - start)
+            if not keep_alive:
+                # e.g. the Flask dev server, which speaks HTTP/1.0
+                writer.close()
+                reader = writer = None
+        except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError) as e:
+            errors.append(type(e).__name__)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+        if think_time:
+            await asyncio.sleep(think_time)
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url, path, concurrency, total_requests, think_time=0.0):
+    """Run a load test against one server and return summary statistics."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    latencies, errors = [], []
+    per_client, extra = divmod(total_requests, concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, path, per_client + (1 if i < extra else 0),
+                think_time, latencies, errors)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'requests': len(latencies) + len(errors),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+    }
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100)
+        result.update(p50=cuts[49], p95=cuts[94], p99=cuts[98])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--target', action='append', required=True,
+                        help='name=url of a running server; repeat to compare')
+    parser.add_argument('--path', default='/api/health')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help='seconds each client waits between requests')
+    args = parser.parse_args()
+
+    print(f"{'target':<10} {'requests':>9} {'errors':>7} {'req/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for target in args.target:
+        name, _, url = target.partition('=')
+        stats = asyncio.run(run_load(
+            url or name, args.path, args.concurrency, args.requests, args.think_time
+        ))
+        print(f"{name:<10} {stats['requests']:>9} {stats['errors']:>7} {stats['rps']:>9.0f} "
+              f"{stats.get('p50', 0) * 1000:>8.1f} {stats.get('p95', 0) * 1000:>8.1f} "
+              f"{stats.get('p99', 0) * 1000:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
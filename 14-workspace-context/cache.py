@@ -0,0 +1,255 @@
+"""
+Cache Layer
+===========
+Pluggable key/value caches used by the service layer.
+
+Two backends are provided:
+- LRUCache: an in-process, thread-safe LRU cache with a per-entry TTL.
+- RemoteCache: a thin wrapper around an out-of-process store with a
+  redis-py style client (`get`, `mget`, `set(..., ex=ttl)`, `delete`).
+  FakeRemoteClient emulates that client locally for development and tests;
+  redis_client connects to a real server (the app does when REDIS_URL is
+  set), so several worker processes can share one cache.
+
+Both backends count hits, misses and evictions so cache sizing can be tuned.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:cache.py How would I plug in a real Redis client here?"
+- "@workspace Which service methods invalidate the user cache?"
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheStats:
+    """Hit/miss/eviction counters for a cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def to_dict(self):
+        """Convert stats to dictionary."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """In-process LRU cache with a time-to-live for every entry."""
+
+    def __init__(self, max_size=10000, ttl_seconds=300):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def _get_locked(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._data[key]
+            self.stats.evictions += 1
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            return self._get_locked(key, time.monotonic())
+
+    def get_many(self, keys):
+        """Return a dict of the keys that are cached, under one lock."""
+        found = {}
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                value = self._get_locked(key, now)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys):
+        """Remove keys from the cache."""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RemoteCache:
+    """Cache backed by an out-of-process store such as Redis.
+
+    Values are pickled, so anything stored must be picklable. The client
+    decides evictions itself, so only hits and misses are counted here.
+    """
+
+    def __init__(self, client, ttl_seconds=300, prefix='cache:'):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key):
+        """Return the cached value, or None if missing."""
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return pickle.loads(raw)
+
+    def get_many(self, keys):
+        """Return a dict of the keys that are cached, in one MGET round trip."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        found = {}
+        for key, raw in zip(keys, self.client.mget([self.prefix + key for key in keys])):
+            if raw is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+                found[key] = pickle.loads(raw)
+        return found
+
+    def set(self, key, value):
+        """Store a value with the configured TTL."""
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=self.ttl_seconds)
+
+    def delete(self, *keys):
+        """Remove keys from the cache."""
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def clear(self):
+        """Remove every entry with this cache's prefix."""
+        keys = list(self.client.scan_iter(self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+class FakeRemoteClient:
+    """In-memory stand-in for a redis-py client.
+
+    Implements just the commands RemoteCache uses, including key expiry.
+    """
+
+    def __init__(self):
+        self._data = {}  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            expires_at = time.monotonic() + ex if ex else None
+            self._data[key] = (expires_at, value)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def scan_iter(self, match='*'):
+        prefix = match.rstrip('*')
+        with self._lock:
+            return [key for key in self._data if key.startswith(prefix)]
+
+
+class NullCache:
+    """Cache that stores nothing; used when caching is disabled."""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key):
+        self.stats.misses += 1
+        return None
+
+    def get_many(self, keys):
+        self.stats.misses += len(list(keys))
+        return {}
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+
+def redis_client(url):
+    """Connect to the Redis server at `url` (needs `pip install redis`).
+
+    redis-py opens connections lazily and reopens them in a forked
+    worker, so one client can be created before the workers fork.
+    """
+    import redis
+
+    return redis.Redis.from_url(url)
+
+
+def create_cache(backend='memory', max_size=10000, ttl_seconds=300, client=None,
+                 prefix='cache:'):
+    """Create a cache for the given backend name.
+
+    `backend` is one of 'memory', 'remote' or 'none'. For 'remote', pass a
+    redis-py compatible `client`; a FakeRemoteClient is used if omitted.
+    Caches sharing one client need different key `prefix`es.
+    """
+    if backend == 'memory':
+        return LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+    if backend == 'remote':
+        return RemoteCache(client or FakeRemoteClient(), ttl_seconds=ttl_seconds, prefix=prefix)
+    if backend == 'none':
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -10,10 +10,11 @@ Open Copilot Chat and ask:
 """
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Settings are read from the environment when this module is imported.
+# Variables in a .env file are loaded by app.load_environment(), which the
+# entry points call before importing this module. Nothing here imports
+# SQLAlchemy: settings derived from the database URI are built on use.
 
 
 class Config:
@@ -27,6 +28,15 @@ class Config:
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 5000))
     
+    # Production server (serve.py): worker processes, threads per worker,
+    # and seconds a worker gets to finish its requests on shutdown/reload
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', 2 * (os.cpu_count() or 1) + 1))
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 4))
+    WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', 30))
+    WEB_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+    WEB_MAX_REQUESTS = int(os.environ.get('WEB_MAX_REQUESTS', 10000))
+    WEB_PIDFILE = os.environ.get('WEB_PIDFILE', 'gunicorn.pid')
+    
     # Database settings
     SQLALCHEMY_DATABASE_URI = os.environ.get(
         'DATABASE_URL',
@@ -35,6 +45,79 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = DEBUG
     
+    # Connection pool settings. create_app turns them into
+    # SQLALCHEMY_ENGINE_OPTIONS unless a config class sets that directly.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))
+    
+    # Queries slower than this are logged (with parameters redacted)
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+    
+    # Async driver URI for the ASGI entry point (asgi.py); derived from
+    # SQLALCHEMY_DATABASE_URI when not set
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URL')
+    
+    # SQLite tuning: WAL lets reads run alongside a write
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    
+    # Redis server behind the 'remote' cache and rate limit backends. Without
+    # it, 'remote' uses an in-process stand-in that is not shared.
+    REDIS_URL = os.environ.get('REDIS_URL')
+    
+    # User cache settings ('memory', 'remote' or 'none')
+    USER_CACHE_BACKEND = os.environ.get('USER_CACHE_BACKEND', 'memory')
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 10000))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))
+    
+    # Rendered list responses are cached briefly and cleared on writes
+    # ('memory', 'remote' or 'none')
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 5))
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+    
+    # User search index ('ngram' in-process, or 'fts5' SQLite FTS5 trigram table)
+    SEARCH_INDEX_BACKEND = os.environ.get('SEARCH_INDEX_BACKEND', 'ngram')
+    SEARCH_INDEX_PATH = os.environ.get('SEARCH_INDEX_PATH', ':memory:')
+    
+    # Listing totals: 'exact' (COUNT every page), 'cached' (reuse for a TTL)
+    # or 'counter' (kept current by writes, re-counted every resync period)
+    USER_COUNT_STRATEGY = os.environ.get('USER_COUNT_STRATEGY', 'cached')
+    USER_COUNT_TTL = int(os.environ.get('USER_COUNT_TTL', 30))
+    USER_COUNT_RESYNC = int(os.environ.get('USER_COUNT_RESYNC', 300))
+    
+    # Bulk import settings
+    BULK_IMPORT_BATCH_SIZE = int(os.environ.get('BULK_IMPORT_BATCH_SIZE', 1000))
+    
+    # Most IDs accepted by one /api/users/batch request
+    USER_BATCH_MAX_IDS = int(os.environ.get('USER_BATCH_MAX_IDS', 1000))
+    
+    # Change feed: most changes returned by one /api/users/changes request
+    CHANGE_FEED_MAX_ITEMS = int(os.environ.get('CHANGE_FEED_MAX_ITEMS', 10000))
+    
+    # Admission control: per-client token bucket ('memory', 'remote' or 'none')
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_CAPACITY = int(os.environ.get('RATE_LIMIT_CAPACITY', 100))
+    RATE_LIMIT_REFILL_PER_SECOND = float(os.environ.get('RATE_LIMIT_REFILL_PER_SECOND', 50))
+    
+    # ...and a cap on requests in progress per process (0 = unlimited)
+    MAX_CONCURRENT_REQUESTS = int(os.environ.get('MAX_CONCURRENT_REQUESTS', 64))
+    CONCURRENCY_QUEUE_TIMEOUT = float(os.environ.get('CONCURRENCY_QUEUE_TIMEOUT', 0.05))
+    
+    # Clients are keyed by one of these API keys (comma-separated) if they
+    # send it in X-API-Key, else by address. X-Forwarded-For is only read
+    # from trusted proxies (comma-separated addresses or networks).
+    API_KEYS = tuple(k.strip() for k in os.environ.get('API_KEYS', '').split(',') if k.strip())
+    TRUSTED_PROXIES = tuple(
+        p.strip() for p in os.environ.get('TRUSTED_PROXIES', '').split(',') if p.strip()
+    )
+    
+    # JSON encoder for listing responses ('auto' uses orjson when installed)
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    
     # Pagination defaults
     DEFAULT_PAGE_SIZE = 10
     MAX_PAGE_SIZE = 100
@@ -43,6 +126,13 @@ class Config:
     BCRYPT_LOG_ROUNDS = 12
     TOKEN_EXPIRATION_HOURS = 24
     
+    # Password hashing pool (workers defaults to the CPU count, 0 = inline)
+    PASSWORD_HASH_WORKERS = (
+        int(os.environ['PASSWORD_HASH_WORKERS'])
+        if 'PASSWORD_HASH_WORKERS' in os.environ else None
+    )
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64))
+    
     # CORS settings
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
 
@@ -51,13 +141,22 @@ class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    
+    # A small pool surfaces connection leaks early
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 2))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 3))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))
 
 
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    ASYNC_DATABASE_URI = 'sqlite+aiosqlite:///:memory:'
     BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    USER_COUNT_STRATEGY = 'exact'
 
 
 class ProductionConfig(Config):
@@ -67,6 +166,20 @@ class ProductionConfig(Config):
     
     # Override with production-specific settings
     BCRYPT_LOG_ROUNDS = 14
+    
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 20))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 5))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 5000))
+    
+    # Durable commits matter more than write speed in production
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'FULL')
+    
+    # Workers are separate processes, so a per-process cache would keep
+    # serving data another worker has changed. Caches are off unless set
+    # to 'remote' with REDIS_URL (serve.py refuses per-process caches).
+    USER_CACHE_BACKEND = os.environ.get('USER_CACHE_BACKEND', 'none')
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'none')
 
 
 # Configuration dictionary
@@ -0,0 +1,166 @@
+"""
+Database Engine Tuning
+======================
+Connection pool settings, SQLite pragmas and pool metrics.
+
+The defaults SQLAlchemy picks are fine for a laptop but not for a server
+with many workers: the pool size bounds concurrency, overflow absorbs
+bursts, recycle/pre-ping survive dropped connections, and a statement
+timeout stops one slow query from holding a connection forever. For local
+SQLite deployments, WAL journaling lets readers proceed while a write is
+in progress.
+
+MeteredQueuePool counts checkouts, checkins, waits and timeouts so the
+pool (and the number of workers sharing the database) can be sized from
+real numbers; see the /api/metrics endpoint.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:database.py #file:config.py How are pool settings chosen per environment?"
+- "@workspace What does WAL mode change for SQLite?"
+"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from metrics import Histogram
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records checkout counts, waits and timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds = Histogram(
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+        )
+
+    def _do_get(self):
+        # With no idle connection and no overflow left, the checkout has to
+        # wait for another thread to return a connection.
+        exhausted = (
+            self.checkedin() == 0
+            and self._max_overflow > -1
+            and self.overflow() >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self.waits += 1
+                self.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._metrics_lock:
+            self.checkouts += 1
+            if exhausted:
+                self.waits += 1
+        self.wait_seconds.observe(elapsed)
+        return conn
+
+    def _do_return_conn(self, record):
+        with self._metrics_lock:
+            self.checkins += 1
+        super()._do_return_conn(record)
+
+
+def engine_options(database_uri, pool_size=5, max_overflow=10, pool_timeout=30,
+                   pool_recycle=1800, pool_pre_ping=True, statement_timeout_ms=None):
+    """Build SQLALCHEMY_ENGINE_OPTIONS for a database URI.
+
+    In-memory SQLite databases live in a single connection, so they keep
+    SQLAlchemy's default pool and get no pool options.
+    """
+    is_sqlite = database_uri.startswith('sqlite')
+    if is_sqlite and (':memory:' in database_uri or database_uri in ('sqlite://', 'sqlite:///')):
+        return {}
+
+    options = {
+        'poolclass': MeteredQueuePool,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': pool_timeout,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': pool_pre_ping,
+    }
+    if statement_timeout_ms and database_uri.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout_ms}'}
+    return options
+
+
+def engine_options_from_config(config):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from an app's DB_POOL_* settings."""
+    return engine_options(
+        config['SQLALCHEMY_DATABASE_URI'],
+        pool_size=config['DB_POOL_SIZE'],
+        max_overflow=config['DB_MAX_OVERFLOW'],
+        pool_timeout=config['DB_POOL_TIMEOUT'],
+        pool_recycle=config['DB_POOL_RECYCLE'],
+        statement_timeout_ms=config['DB_STATEMENT_TIMEOUT_MS']
+    )
+
+
+# Async drivers used for the ASGI entry point, by sync URI scheme
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def async_database_uri(database_uri):
+    """Convert a sync database URI to the matching async driver URI."""
+    scheme, sep, rest = database_uri.partition('://')
+    base = scheme.split('+', 1)[0]
+    if base not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for database URI scheme '{scheme}'")
+    return ASYNC_DRIVERS[base] + sep + rest
+
+
+def configure_sqlite_pragmas(engine, journal_mode='WAL', synchronous='NORMAL'):
+    """Set journal mode and sync level on every new SQLite connection."""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if journal_mode:
+                cursor.execute(f'PRAGMA journal_mode={journal_mode}')
+            if synchronous:
+                cursor.execute(f'PRAGMA synchronous={synchronous}')
+        finally:
+            cursor.close()
+
+
+def pool_stats(engine):
+    """Get connection pool status and counters for an engine."""
+    pool = engine.pool
+    stats = {'class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+        })
+    if isinstance(pool, MeteredQueuePool):
+        stats.update({
+            'checkouts': pool.checkouts,
+            'checkins': pool.checkins,
+            'waits': pool.waits,
+            'timeouts': pool.timeouts,
+            'wait_seconds': pool.wait_seconds.to_dict(),
+        })
+    return stats
@@ -0,0 +1,187 @@
+"""
+Password Hashing Service
+========================
+Runs password hashing off the request thread in a bounded process pool.
+
+Hashing is deliberately CPU-expensive. Doing it on the request thread
+blocks the worker for the whole hash, so bursts of signups starve other
+requests. PasswordHasher sends the work to a process pool instead and
+limits how many hashes may be pending at once; when the limit is reached
+callers get HashingBusyError rather than queueing without bound.
+
+The cost factor comes from `BCRYPT_LOG_ROUNDS`. Hashes are produced with
+werkzeug's scrypt method, and the log rounds select its CPU/memory cost:
+N = 2 ** (log_rounds + 3), so 12 rounds is werkzeug's default N = 32768
+and every extra round doubles the cost.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:hashing.py Why use a process pool instead of a thread pool here?"
+- "@workspace Where are passwords rehashed when the cost factor changes?"
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import Histogram
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when too many password hashes are already pending."""
+
+
+def method_for_rounds(log_rounds):
+    """Get the werkzeug hash method string for a cost factor."""
+    return f'scrypt:{2 ** (log_rounds + 3)}:8:1'
+
+
+# werkzeug is imported on first use, which keeps importing this module cheap
+def _hash_password(password, method):
+    from werkzeug.security import generate_password_hash
+    return generate_password_hash(password, method=method)
+
+
+def _verify_password(password_hash, password):
+    from werkzeug.security import check_password_hash
+    return check_password_hash(password_hash, password)
+
+
+class PasswordHasher:
+    """Hash and verify passwords in a bounded worker pool.
+
+    With `max_workers=0` work runs inline on the calling thread, which is
+    useful for tests and one-off scripts.
+    """
+
+    def __init__(self, log_rounds=12, max_workers=None, max_pending=64,
+                 acquire_timeout=5.0):
+        self.log_rounds = log_rounds
+        self.method = method_for_rounds(log_rounds)
+        self.max_workers = os.cpu_count() if max_workers is None else max_workers
+        self.acquire_timeout = acquire_timeout
+        self.hash_latency = Histogram()
+        self.verify_latency = Histogram()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Bulk hashing holds at most this many slots at once, leaving the
+        # rest for logins and signups
+        self.bulk_chunk = max(1, min(self.max_workers or 1, max_pending // 2))
+        self._bulk_lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        """Create the process pool on first use.
+
+        Workers are started from a clean forkserver (or spawned) rather
+        than forked from this process, whose other threads may be holding
+        locks at the moment of the fork. A pool inherited through fork
+        (e.g. by a server worker) belongs to the parent and is replaced.
+        """
+        with self._executor_lock:
+            if self._executor is not None and self._executor_pid != os.getpid():
+                self._executor = None
+            if self._executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    'forkserver' if 'forkserver' in methods else 'spawn'
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, histogram, func, *args):
+        """Run one hashing job, waiting for a free slot first."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise HashingBusyError("Too many password hashes pending, try again later")
+        start = time.perf_counter()
+        try:
+            if self.max_workers == 0:
+                return func(*args)
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            self._slots.release()
+            histogram.observe(time.perf_counter() - start)
+
+    def hash(self, password):
+        """Hash a password with the configured cost factor."""
+        return self._run(self.hash_latency, _hash_password, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash."""
+        return self._run(self.verify_latency, _verify_password, password_hash, password)
+
+    def hash_many(self, passwords):
+        """Hash several passwords in parallel, returning hashes in order.
+
+        Used by bulk imports. The batch takes the same pending-hash slots
+        as single hashes, `bulk_chunk` at a time, and waits for them rather
+        than failing. Chunks from concurrent imports run one after another,
+        so bulk work never holds more than half of the slots and requests
+        hashing one password keep their limit.
+        """
+        passwords = list(passwords)
+        hashes = []
+        for offset in range(0, len(passwords), self.bulk_chunk):
+            chunk = passwords[offset:offset + self.bulk_chunk]
+            with self._bulk_lock:
+                for _ in chunk:
+                    self._slots.acquire()
+                start = time.perf_counter()
+                try:
+                    if self.max_workers == 0 or len(chunk) < 2:
+                        hashes.extend(_hash_password(p, self.method) for p in chunk)
+                    else:
+                        executor = self._get_executor()
+                        futures = [executor.submit(_hash_password, p, self.method) for p in chunk]
+                        hashes.extend(future.result() for future in futures)
+                finally:
+                    for _ in chunk:
+                        self._slots.release()
+            per_hash = (time.perf_counter() - start) / len(chunk)
+            for _ in chunk:
+                self.hash_latency.observe(per_hash)
+        return hashes
+
+    def needs_rehash(self, password_hash):
+        """Return True if a hash was made with a different cost factor."""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def stats(self):
+        """Get hashing configuration and latency histograms."""
+        return {
+            'method': self.method,
+            'log_rounds': self.log_rounds,
+            'workers': self.max_workers,
+            'hash_latency_seconds': self.hash_latency.to_dict(),
+            'verify_latency_seconds': self.verify_latency.to_dict(),
+        }
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._executor_lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+
+_password_hasher = PasswordHasher()
+
+
+def get_password_hasher():
+    """Get the application-wide password hasher."""
+    return _password_hasher
+
+
+def configure_password_hasher(hasher):
+    """Replace the application-wide password hasher."""
+    global _password_hasher
+    old = _password_hasher
+    _password_hasher = hasher
+    if old is not hasher:
+        old.shutdown()
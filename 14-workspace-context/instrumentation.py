@@ -0,0 +1,188 @@
+"""
+Request Instrumentation
+=======================
+Per-endpoint latency, per-request database usage and a slow-query log.
+
+`init_instrumentation(app, engine)` installs:
+- Flask before/after request hooks that time every request and record it
+  against its URL rule (not the raw path, to keep label cardinality low).
+- SQLAlchemy cursor hooks that count queries and database time for the
+  current request, and log any statement slower than the threshold.
+  Parameters are never logged - only their count and types.
+
+`render_prometheus()` writes everything in the Prometheus text exposition
+format, served by the app at /metrics.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:instrumentation.py How are query counts tied to a request?"
+- "@workspace How would I scrape these metrics with Prometheus?"
+"""
+
+import logging
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from database import pool_stats
+from metrics import Histogram
+
+
+slow_query_logger = logging.getLogger('app.slow_query')
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestMetrics:
+    """Histograms and counters keyed by (endpoint, method)."""
+
+    def __init__(self):
+        self.latency = {}       # (endpoint, method) -> Histogram
+        self.db_time = {}       # (endpoint, method) -> Histogram
+        self.db_queries = {}    # (endpoint, method) -> Histogram
+        self.requests = {}      # (endpoint, method, status) -> count
+        self.slow_queries = 0
+        self._lock = threading.Lock()
+
+    def _histogram(self, table, key, buckets=Histogram.DEFAULT_BUCKETS):
+        with self._lock:
+            histogram = table.get(key)
+            if histogram is None:
+                histogram = table[key] = Histogram(buckets=buckets)
+            return histogram
+
+    def record_request(self, endpoint, method, status, seconds, queries, db_seconds):
+        """Record one finished request."""
+        key = (endpoint, method)
+        self._histogram(self.latency, key).observe(seconds)
+        self._histogram(self.db_time, key).observe(db_seconds)
+        self._histogram(self.db_queries, key, QUERY_COUNT_BUCKETS).observe(queries)
+        with self._lock:
+            request_key = (endpoint, method, str(status))
+            self.requests[request_key] = self.requests.get(request_key, 0) + 1
+
+    def record_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+
+request_metrics = RequestMetrics()
+
+
+def _describe_parameters(parameters):
+    """Summarize statement parameters without revealing their values."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def init_instrumentation(app, engine, slow_query_threshold_ms=200):
+    """Install request timing and query hooks on an app and its engine."""
+    threshold = slow_query_threshold_ms / 1000.0
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        g.db_queries = 0
+        g.db_seconds = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('request_started')
+        if started is not None:
+            endpoint = request.url_rule.rule if request.url_rule else '<unmatched>'
+            request_metrics.record_request(
+                endpoint,
+                request.method,
+                response.status_code,
+                time.perf_counter() - started,
+                g.get('db_queries', 0),
+                g.get('db_seconds', 0.0)
+            )
+        return response
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the statement's execution context rather than the
+        # connection, so a statement that fails leaves nothing behind
+        if context is not None:
+            context.query_started = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'query_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if has_request_context():
+            g.db_queries = g.get('db_queries', 0) + 1
+            g.db_seconds = g.get('db_seconds', 0.0) + elapsed
+        if elapsed >= threshold:
+            request_metrics.record_slow_query()
+            slow_query_logger.warning(
+                "Slow query (%.1f ms): %s | parameters: %s",
+                elapsed * 1000,
+                ' '.join(statement.split()),
+                'executemany' if executemany else _describe_parameters(parameters)
+            )
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def _histogram_lines(name, help_text, table):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for (endpoint, method), histogram in sorted(table.items()):
+        data = histogram.to_dict()
+        labels = _labels(endpoint=endpoint, method=method)
+        for bound, count in data['buckets'].items():
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'{name}_sum{{{labels}}} {data["sum"]}')
+        lines.append(f'{name}_count{{{labels}}} {data["count"]}')
+    return lines
+
+
+def render_prometheus(engine=None):
+    """Render request, query and pool metrics in Prometheus text format."""
+    metrics = request_metrics
+    lines = _histogram_lines(
+        'http_request_duration_seconds', 'Request latency by endpoint.', metrics.latency
+    )
+    lines += _histogram_lines(
+        'http_request_db_seconds', 'Database time per request by endpoint.', metrics.db_time
+    )
+    lines += _histogram_lines(
+        'http_request_db_queries', 'Database queries per request by endpoint.',
+        metrics.db_queries
+    )
+
+    lines += ['# HELP http_requests_total Requests by endpoint and status.',
+              '# TYPE http_requests_total counter']
+    for (endpoint, method, status), count in sorted(metrics.requests.items()):
+        labels = _labels(endpoint=endpoint, method=method, status=status)
+        lines.append(f'http_requests_total{{{labels}}} {count}')
+
+    lines += ['# HELP db_slow_queries_total Queries slower than the slow-query threshold.',
+              '# TYPE db_slow_queries_total counter',
+              f'db_slow_queries_total {metrics.slow_queries}']
+
+    if engine is not None:
+        stats = pool_stats(engine)
+        for key in ('size', 'checked_out', 'checked_in', 'overflow'):
+            if key in stats:
+                lines += [f'# TYPE db_pool_{key} gauge', f'db_pool_{key} {stats[key]}']
+        for key in ('checkouts', 'waits', 'timeouts'):
+            if key in stats:
+                lines += [f'# TYPE db_pool_{key}_total counter',
+                          f'db_pool_{key}_total {stats[key]}']
+
+    return '\n'.join(lines) + '\n'
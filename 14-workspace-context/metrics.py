@@ -0,0 +1,49 @@
+"""
+Metrics
+=======
+Small, dependency-free metric types shared across the application.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:metrics.py How are histogram buckets counted?"
+"""
+
+import threading
+
+
+class Histogram:
+    """A cumulative histogram of observed values (e.g. latencies in seconds)."""
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Record one observation."""
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def to_dict(self):
+        """Convert histogram to dictionary with cumulative bucket counts."""
+        with self._lock:
+            cumulative = {}
+            running = 0
+            for bound, count in zip(self.buckets, self._counts):
+                running += count
+                cumulative[str(bound)] = running
+            cumulative['+Inf'] = self.count
+            return {
+                'count': self.count,
+                'sum': round(self.sum, 6),
+                'buckets': cumulative,
+            }
@@ -0,0 +1,95 @@
+"""
+Schema Migrations
+=================
+Versioned, forward-only schema changes for databases that already exist.
+
+`db.create_all()` creates missing tables but never changes existing ones,
+so indexes added to the models would only reach new databases. Each
+migration here has a version number and a function that runs inside a
+transaction. The `schema_version` table records the versions applied so
+far, and `upgrade()` runs the ones still pending, in order.
+
+Apply pending migrations with:
+    python migrations.py
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:migrations.py How do I add a migration for a new column?"
+- "@workspace Compare this with using Alembic"
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select
+
+from models import Post, User
+
+
+_version_metadata = MetaData()
+
+schema_version = Table(
+    'schema_version', _version_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+
+def _create_indexes(connection, table, *names):
+    for index in table.indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+
+def _create_tables(connection):
+    User.metadata.create_all(connection)
+
+
+def _add_listing_indexes(connection):
+    _create_indexes(connection, User.__table__,
+                    'ix_users_active_id', 'ix_users_active_created_at')
+    _create_indexes(connection, Post.__table__, 'ix_posts_user_created_at')
+
+
+# (version, description, function) - append new migrations, never edit old ones
+MIGRATIONS = [
+    (1, 'Create tables', _create_tables),
+    (2, 'Add active-user listing indexes and posts-by-user index', _add_listing_indexes),
+]
+
+
+def current_version(connection):
+    """Get the highest applied migration version (0 for a new database)."""
+    _version_metadata.create_all(connection)
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def upgrade(engine, target=None):
+    """Apply pending migrations up to `target` (default: all).
+
+    Returns the (version, description) pairs that were applied.
+    """
+    applied = []
+    with engine.begin() as connection:
+        version = current_version(connection)
+        for number, description, migrate in MIGRATIONS:
+            if number <= version or (target is not None and number > target):
+                continue
+            migrate(connection)
+            connection.execute(schema_version.insert().values(
+                version=number, description=description
+            ))
+            applied.append((number, description))
+    return applied
+
+
+if __name__ == '__main__':
+    from app import app
+    from models import db
+
+    with app.app_context():
+        applied = upgrade(db.engine)
+    for number, description in applied:
+        print(f"Applied migration {number}: {description}")
+    if not applied:
+        print("Database schema is up to date")
@@ -11,7 +11,8 @@ Open Copilot Chat and ask:
 
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+import json
+from hashing import get_password_hasher
 
 db = SQLAlchemy()
 
@@ -29,6 +30,17 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Listings only ever read active users. The composite index serves the
+    # id-ordered pages and the active-user count; the partial index (SQLite
+    # and PostgreSQL) leaves out soft-deleted rows and serves the
+    # created_at-ordered cursor pages.
+    __table_args__ = (
+        db.Index('ix_users_active_id', is_active, id),
+        db.Index('ix_users_active_created_at', created_at, id,
+                 sqlite_where=is_active == True,  # noqa: E712
+                 postgresql_where=is_active == True),  # noqa: E712
+    )
+    
     # Relationships
     posts = db.relationship('Post', backref='author', lazy='dynamic')
     
@@ -37,13 +49,18 @@ class User(db.Model):
         self.email = email
         self.set_password(password)
     
+    @staticmethod
+    def hash_password(password):
+        """Hash a password without creating a User."""
+        return get_password_hasher().hash(password)
+    
     def set_password(self, password):
         """Hash and set the password."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = User.hash_password(password)
     
     def check_password(self, password):
         """Verify the password."""
-        return check_password_hash(self.password_hash, password)
+        return get_password_hasher().verify(self.password_hash, password)
     
     def to_dict(self):
         """Convert user to dictionary."""
@@ -72,6 +89,11 @@ class Post(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # A user's posts, newest first: the posts page, counts and recent posts
+    __table_args__ = (
+        db.Index('ix_posts_user_created_at', user_id, created_at, id),
+    )
+    
     def to_dict(self):
         """Convert post to dictionary."""
         return {
@@ -87,6 +109,33 @@ class Post(db.Model):
         return f'<Post {self.title}>'
 
 
+class UserChange(db.Model):
+    """Change log (outbox) entry for one user create, update or delete."""
+    
+    __tablename__ = 'user_changes'
+    # AUTOINCREMENT keeps SQLite from reusing sequence numbers
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    seq = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    op = db.Column(db.String(10), nullable=False)
+    payload = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert change to dictionary."""
+        return {
+            'seq': self.seq,
+            'user_id': self.user_id,
+            'op': self.op,
+            'user': json.loads(self.payload) if self.payload else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+    
+    def __repr__(self):
+        return f'<UserChange {self.seq} {self.op} {self.user_id}>'
+
+
 # TODO: Ask Copilot with @workspace:
 # "What other models might this application need?"
 # "How do I add a Comment model related to Post?"
@@ -0,0 +1,238 @@
+"""
+Keyset Pagination
+=================
+Cursor-based ("keyset") pagination helpers for the service layer.
+
+OFFSET pagination has to walk past every skipped row, so page N costs
+O(N * per_page). Keyset pagination remembers the sort key of the last row
+that was returned and asks the database for rows *after* it, which an index
+can answer directly - page N costs the same as page 1.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:pagination.py Why is keyset pagination faster than OFFSET?"
+- "@workspace How is the `after` cursor passed from app.py to the service?"
+"""
+
+import base64
+import binascii
+import json
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+# Sort orders supported by the keyset paginator. The primary key is always
+# the last column so that every cursor identifies exactly one row.
+KEYSET_ORDERINGS = ('id', 'created_at')
+
+
+class InvalidCursorError(ValueError):
+    """Raised when an `after` cursor cannot be decoded."""
+
+
+def encode_cursor(order_by, values):
+    """Encode the sort key of the last row into an opaque cursor string."""
+    payload = {
+        'o': order_by,
+        'k': [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, order_by):
+    """Decode a cursor produced by `encode_cursor`.
+
+    Returns the list of key values, converting timestamps back to datetimes.
+    Raises InvalidCursorError if the cursor is malformed or was issued for a
+    different sort order.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = payload['k']
+        cursor_order = payload['o']
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    if cursor_order != order_by:
+        raise InvalidCursorError("Cursor does not match the requested ordering")
+
+    if order_by == 'created_at':
+        if not isinstance(values, list) or len(values) != 2:
+            raise InvalidCursorError("Invalid pagination cursor")
+        try:
+            return [datetime.fromisoformat(values[0]), int(values[1])]
+        except (TypeError, ValueError):
+            raise InvalidCursorError("Invalid pagination cursor")
+
+    if not isinstance(values, list) or len(values) != 1:
+        raise InvalidCursorError("Invalid pagination cursor")
+    try:
+        return [int(values[0])]
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+class KeysetPage:
+    """One page of results from a keyset query."""
+
+    def __init__(self, items, next_cursor, per_page, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.per_page = per_page
+        self.total = total
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+
+def keyset_paginate(query, model, after=None, per_page=10, order_by='id'):
+    """Apply keyset pagination to a query and return a KeysetPage.
+
+    Fetches one extra row to find out whether another page exists, so no
+    COUNT(*) query is needed to build the `next` cursor.
+    """
+    if order_by not in KEYSET_ORDERINGS:
+        raise ValueError(f"order_by must be one of {list(KEYSET_ORDERINGS)}")
+
+    if order_by == 'created_at':
+        columns = (model.created_at, model.id)
+    else:
+        columns = (model.id,)
+
+    if after:
+        values = decode_cursor(after, order_by)
+        if len(columns) == 2:
+            # Row-value comparison written out longhand so it also works on
+            # SQLite: (created_at, id) > (:created_at, :id)
+            query = query.filter(or_(
+                columns[0] > values[0],
+                and_(columns[0] == values[0], columns[1] > values[1]),
+            ))
+        else:
+            query = query.filter(columns[0] > values[0])
+
+    rows = query.order_by(*columns).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            order_by, [getattr(last, c.key) for c in columns]
+        )
+
+    return KeysetPage(rows, next_cursor, per_page)
+
+
+class IndexPage:
+    """One page of results with a known total, e.g. from a search index.
+
+    Mirrors the attributes of Flask-SQLAlchemy's Pagination object that the
+    API uses, so callers can treat both the same way.
+    """
+
+    def __init__(self, items, total, page, per_page):
+        self.items = items
+        self.total = total
+        self.page = page
+        self.per_page = per_page
+
+    @property
+    def pages(self):
+        if self.per_page <= 0 or self.total == 0:
+            return 0
+        return -(-self.total // self.per_page)
+
+
+class ExactCount:
+    """Counts rows with a fresh COUNT(*) every time."""
+
+    def get(self, count_func):
+        """Return `count_func()`."""
+        return count_func()
+
+    def adjust(self, delta):
+        """Nothing to adjust; every call counts again."""
+
+    def invalidate(self):
+        """Nothing is cached."""
+
+
+class CachedCount:
+    """A COUNT(*) result cached for a short time.
+
+    Exact totals are expensive on large tables and rarely need to be
+    precise to the row, so listings reuse a recent value. Writes made
+    since it was counted show up once it expires.
+    """
+
+    def __init__(self, ttl_seconds=30):
+        self.ttl_seconds = ttl_seconds
+        self._value = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, count_func):
+        """Return the cached count, calling `count_func` when it has expired."""
+        now = time.monotonic()
+        with self._lock:
+            if self._value is not None and now < self._expires_at:
+                return self._value
+        value = count_func()
+        with self._lock:
+            self._value = value
+            self._expires_at = now + self.ttl_seconds
+        return value
+
+    def adjust(self, delta):
+        """Ignored; the cached count simply expires."""
+
+    def invalidate(self):
+        """Forget the cached count."""
+        with self._lock:
+            self._value = None
+            self._expires_at = 0.0
+
+
+class MaintainedCount(CachedCount):
+    """A count kept current by the writes themselves.
+
+    Seeded with one COUNT(*), then moved by `adjust()` as rows are created
+    and deleted, so listings do not count at all. Writes from other
+    processes are not seen, so the count is approximate and is re-seeded
+    every `resync_seconds`.
+    """
+
+    def __init__(self, resync_seconds=300):
+        super().__init__(ttl_seconds=resync_seconds)
+
+    def adjust(self, delta):
+        """Add `delta` to the count, once it has been seeded."""
+        with self._lock:
+            if self._value is not None:
+                self._value = max(0, self._value + delta)
+
+
+COUNT_STRATEGIES = ('exact', 'cached', 'counter')
+
+
+def create_count_strategy(strategy='cached', ttl_seconds=30, resync_seconds=300):
+    """Create a total-count strategy for listings.
+
+    `strategy` is 'exact' (COUNT(*) on every page), 'cached' (reuse a
+    count for `ttl_seconds`) or 'counter' (maintained by writes, re-seeded
+    every `resync_seconds`).
+    """
+    if strategy == 'exact':
+        return ExactCount()
+    if strategy == 'cached':
+        return CachedCount(ttl_seconds=ttl_seconds)
+    if strategy == 'counter':
+        return MaintainedCount(resync_seconds=resync_seconds)
+    raise ValueError(f"Unknown count strategy: {strategy}")
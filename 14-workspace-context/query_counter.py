@@ -0,0 +1,59 @@
+"""
+Query Counter
+=============
+Count the SQL statements an engine executes, for tests and debugging.
+
+N+1 query bugs are easy to introduce and hard to spot by reading code. Wrap
+the code under test in `count_queries` (or `assert_max_queries`) to pin the
+number of round trips it is allowed to make.
+
+Example:
+    with assert_max_queries(db.engine, 3):
+        client.get('/api/users?include=posts_count,recent_posts')
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:query_counter.py How would I use this in a pytest fixture?"
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Collects statements executed on an engine while active."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters,
+                               context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    """Count the statements executed on `engine` inside the block."""
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter._before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter._before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(engine, max_queries):
+    """Fail with AssertionError if the block runs more than `max_queries`."""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > max_queries:
+        executed = '\n'.join(f'  {s}' for s in counter.statements)
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {counter.count}:\n{executed}"
+        )
@@ -0,0 +1,88 @@
+"""
+Query Plan Checks
+=================
+Catch hot queries that fall back to a full table scan.
+
+An index only helps while the planner keeps choosing it. A changed filter
+or ORDER BY can quietly turn an index lookup into a scan of every row,
+and nothing fails until the table is large. `assert_no_full_scans` runs
+EXPLAIN on every SELECT executed inside a block and fails if any plan
+scans a whole table.
+
+Example:
+    with assert_no_full_scans(db.engine, tables={'users', 'posts'}):
+        client.get('/api/users?page=2')
+
+Supports SQLite (EXPLAIN QUERY PLAN) and PostgreSQL (EXPLAIN). See
+benchmarks/check_query_plans.py for the checks run against the app's hot
+endpoints.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:query_plans.py #file:models.py Which index serves each listing query?"
+"""
+
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+_POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def explain(dbapi_connection, dialect_name, statement, parameters=()):
+    """Return the plan for a statement as a list of lines."""
+    cursor = dbapi_connection.cursor()
+    try:
+        if dialect_name == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+            return [row[-1] for row in cursor.fetchall()]
+        if dialect_name == 'postgresql':
+            cursor.execute('EXPLAIN ' + statement, parameters)
+            return [row[0] for row in cursor.fetchall()]
+        raise ValueError(f"Query plans are not supported for dialect '{dialect_name}'")
+    finally:
+        cursor.close()
+
+
+def full_scans(plan, dialect_name, tables=None):
+    """Get the names of tables a plan reads in full."""
+    pattern = _SQLITE_FULL_SCAN if dialect_name == 'sqlite' else _POSTGRES_FULL_SCAN
+    scanned = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match and (tables is None or match.group(1) in tables):
+            scanned.append(match.group(1))
+    return scanned
+
+
+@contextmanager
+def assert_no_full_scans(engine, tables=None):
+    """Fail with AssertionError if a SELECT in the block scans a whole table.
+
+    Only `tables` are checked when given; pass the application's tables so
+    scans of subqueries and CTEs are not reported.
+    """
+    problems = []
+
+    def check_plan(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith('SELECT'):
+            return
+        dialect_name = conn.dialect.name
+        plan = explain(cursor.connection, dialect_name, statement, parameters)
+        if full_scans(plan, dialect_name, tables):
+            problems.append((statement, plan))
+
+    event.listen(engine, 'after_cursor_execute', check_plan)
+    try:
+        yield problems
+    finally:
+        event.remove(engine, 'after_cursor_execute', check_plan)
+    if problems:
+        report = '\n\n'.join(
+            f'  {" ".join(statement.split())}\n' + '\n'.join(f'    {line}' for line in plan)
+            for statement, plan in problems
+        )
+        raise AssertionError(f"{len(problems)} queries scan a whole table:\n{report}")
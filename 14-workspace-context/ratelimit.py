@@ -0,0 +1,353 @@
+"""
+Rate Limiting and Admission Control
+===================================
+Sheds excess load at the door instead of letting it pile up on the database.
+
+Two independent guards run before every request:
+- A token-bucket rate limiter per client key (a known API key, else the
+  client address).
+  Each client may burst up to `capacity` requests and is refilled at
+  `refill_per_second`; beyond that it gets 429 with Retry-After.
+- A concurrency limiter that caps the requests in progress in this
+  process. When every slot is busy and none frees up within a short
+  wait, the request gets 503 with Retry-After, before a queue can build.
+
+Rate limiter backends:
+- MemoryRateLimiter: per process, bounded to `max_keys` client buckets.
+- RemoteRateLimiter: shared by every worker through a redis-py style
+  client; the bucket is updated atomically by a Lua script run with
+  `register_script`. FakeRateLimitClient emulates that client locally.
+
+Clients are keyed by create_client_key. An X-API-Key header counts only
+if it is one of the configured keys; any other value would let a client
+pick a fresh bucket per request. Otherwise the client's address is used.
+X-Forwarded-For is read only when the request came from a trusted proxy,
+and only the hops appended by trusted proxies are skipped.
+
+Allowed/limited/rejected counters appear under /api/metrics and /metrics
+so the limits can be tuned from real traffic.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:ratelimit.py Explain how the token bucket refills"
+- "@workspace Which endpoints are exempt from rate limiting?"
+"""
+
+import hashlib
+import ipaddress
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, jsonify, request
+
+
+# KEYS[1] = bucket key; ARGV = capacity, refill_per_second, cost.
+# Returns {allowed (0/1), retry_after_seconds as a string}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+def take_tokens(tokens, updated_at, now, capacity, refill_per_second, cost=1):
+    """Refill a bucket and try to take `cost` tokens from it.
+
+    Returns (allowed, tokens_left, retry_after_seconds).
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_per_second)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / refill_per_second
+
+
+class RateLimitStats:
+    """Allowed/limited counters for a rate limiter."""
+
+    def __init__(self):
+        self.allowed = 0
+        self.limited = 0
+        self._lock = threading.Lock()
+
+    def record(self, allowed):
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.limited += 1
+
+    def to_dict(self):
+        total = self.allowed + self.limited
+        return {
+            'allowed': self.allowed,
+            'limited': self.limited,
+            'limited_ratio': self.limited / total if total else 0.0,
+        }
+
+
+class MemoryRateLimiter:
+    """In-process token buckets, one per client key.
+
+    The least recently seen buckets are dropped beyond `max_keys`; a
+    dropped client simply starts again with a full bucket.
+    """
+
+    def __init__(self, capacity=20, refill_per_second=10.0, max_keys=100000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self.stats = RateLimitStats()
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def hit(self, key, cost=1):
+        """Take tokens for one request; return (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            allowed, tokens, retry_after = take_tokens(
+                tokens, updated_at, now, self.capacity, self.refill_per_second, cost
+            )
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        self.stats.record(allowed)
+        return allowed, retry_after
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RemoteRateLimiter:
+    """Token buckets kept in a shared store, so all workers share one limit."""
+
+    def __init__(self, client, capacity=20, refill_per_second=10.0, prefix='ratelimit:'):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.prefix = prefix
+        self.stats = RateLimitStats()
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def hit(self, key, cost=1):
+        """Take tokens for one request; return (allowed, retry_after_seconds)."""
+        allowed, retry_after = self._script(
+            keys=[self.prefix + key],
+            args=[self.capacity, self.refill_per_second, cost]
+        )
+        allowed = bool(int(allowed))
+        self.stats.record(allowed)
+        return allowed, float(retry_after)
+
+
+class FakeRateLimitClient:
+    """In-memory stand-in for a redis-py client running TOKEN_BUCKET_SCRIPT.
+
+    `register_script` only understands the token bucket script, which it
+    runs as the equivalent Python under a lock (Redis runs scripts
+    atomically too).
+    """
+
+    def __init__(self):
+        self._buckets = {}  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def register_script(self, script):
+        if script != TOKEN_BUCKET_SCRIPT:
+            raise NotImplementedError("FakeRateLimitClient only runs TOKEN_BUCKET_SCRIPT")
+
+        def run(keys, args):
+            capacity, rate, cost = (float(arg) for arg in args)
+            now = time.time()
+            with self._lock:
+                tokens, updated_at = self._buckets.get(keys[0], (capacity, now))
+                allowed, tokens, retry_after = take_tokens(
+                    tokens, updated_at, now, capacity, rate, cost
+                )
+                self._buckets[keys[0]] = (tokens, now)
+            return [1 if allowed else 0, str(retry_after)]
+        return run
+
+
+class NullRateLimiter:
+    """Rate limiter that allows everything; used when limiting is disabled."""
+
+    def __init__(self):
+        self.stats = RateLimitStats()
+
+    def hit(self, key, cost=1):
+        self.stats.record(True)
+        return True, 0.0
+
+
+def create_rate_limiter(backend='memory', capacity=20, refill_per_second=10.0,
+                        max_keys=100000, client=None):
+    """Create a rate limiter for the given backend name.
+
+    `backend` is one of 'memory', 'remote' or 'none'. For 'remote', pass a
+    redis-py compatible `client`; a FakeRateLimitClient is used if omitted.
+    """
+    if backend == 'memory':
+        return MemoryRateLimiter(capacity, refill_per_second, max_keys=max_keys)
+    if backend == 'remote':
+        return RemoteRateLimiter(client or FakeRateLimitClient(), capacity, refill_per_second)
+    if backend == 'none':
+        return NullRateLimiter()
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+class ConcurrencyLimiter:
+    """Caps the number of requests in progress.
+
+    A request waits at most `queue_timeout` seconds for a slot and is
+    rejected after that. `max_concurrent=0` disables the limit.
+    """
+
+    def __init__(self, max_concurrent=64, queue_timeout=0.05):
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self.admitted = 0
+        self.rejected = 0
+        self.active = 0
+        self.peak = 0
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a slot; return False if none became free in time."""
+        if self._slots is not None and not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.admitted += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def stats(self):
+        return {
+            'max_concurrent': self.max_concurrent,
+            'active': self.active,
+            'peak': self.peak,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+        }
+
+
+def _digest(api_key):
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+def _is_trusted(address, networks):
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def create_client_key(api_keys=(), trusted_proxies=()):
+    """Create a function that identifies the client of the current request.
+
+    A client that sends one of `api_keys` in X-API-Key is keyed by that
+    key (by its digest, so keys never reach a shared limiter backend).
+    Anyone else is keyed by address. `trusted_proxies` are addresses or
+    networks (e.g. '10.0.0.0/8') whose X-Forwarded-For is believed: the
+    header is read from the nearest hop back, past trusted proxies, to
+    the first address they did not add.
+    """
+    key_digests = frozenset(_digest(key) for key in api_keys if key)
+    networks = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies if proxy]
+
+    def client_key():
+        api_key = request.headers.get('X-API-Key')
+        if api_key and key_digests:
+            digest = _digest(api_key)
+            if digest in key_digests:
+                return 'key:' + digest[:16]
+
+        address = request.remote_addr or 'unknown'
+        if networks and _is_trusted(address, networks):
+            hops = [hop.strip() for hop in request.headers.get('X-Forwarded-For', '').split(',')]
+            hops = [hop for hop in hops if hop]
+            while hops and _is_trusted(address, networks):
+                address = hops.pop()
+        return 'ip:' + address
+
+    return client_key
+
+
+# Keyed by address only: no API keys configured and no proxies trusted
+client_key = create_client_key()
+
+
+def _rejected(message, status, retry_after):
+    response = jsonify({'error': message})
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response, status
+
+
+def init_admission_control(app, rate_limiter, concurrency_limiter, exempt_paths=(),
+                           key_func=client_key):
+    """Install the rate and concurrency limits as request hooks on an app."""
+    exempt_paths = frozenset(exempt_paths)
+
+    @app.before_request
+    def admit_request():
+        if request.path in exempt_paths:
+            return None
+        allowed, retry_after = rate_limiter.hit(key_func())
+        if not allowed:
+            return _rejected('Rate limit exceeded', 429, retry_after)
+        if not concurrency_limiter.acquire():
+            return _rejected('Server busy, try again later', 503, 1)
+        g.admitted = True
+        return None
+
+    @app.teardown_request
+    def release_slot(error=None):
+        if g.pop('admitted', False):
+            concurrency_limiter.release()
+
+
+def render_admission_metrics(rate_limiter, concurrency_limiter):
+    """Render limiter counters in Prometheus text format."""
+    rate = rate_limiter.stats.to_dict()
+    concurrency = concurrency_limiter.stats()
+    lines = [
+        '# HELP http_rate_limited_total Requests rejected by the rate limiter.',
+        '# TYPE http_rate_limited_total counter',
+        f'http_rate_limited_total {rate["limited"]}',
+        '# HELP http_concurrency_rejected_total Requests shed by the concurrency limiter.',
+        '# TYPE http_concurrency_rejected_total counter',
+        f'http_concurrency_rejected_total {concurrency["rejected"]}',
+        '# TYPE http_requests_in_progress gauge',
+        f'http_requests_in_progress {concurrency["active"]}',
+    ]
+    return '\n'.join(lines) + '\n'
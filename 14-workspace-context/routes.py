@@ -0,0 +1,440 @@
+"""
+API Routes
+==========
+HTTP endpoints for the user API, registered on the app by create_app().
+
+Routes live on the `api` blueprint so the application can be built on
+demand by the factory in app.py. Settings come from `current_app.config`,
+so each app uses the configuration it was created with.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "@workspace How do I add a new endpoint?"
+- "#file:routes.py Which endpoints are cached, and how are they invalidated?"
+"""
+
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import Blueprint, current_app, jsonify, request, stream_with_context
+from models import db
+from database import pool_stats
+from hashing import HashingBusyError, get_password_hasher
+from instrumentation import render_prometheus
+from ratelimit import render_admission_metrics
+from serializers import dumps, parse_fields, rows_to_dicts, user_columns
+from services import PostService, UserService
+
+api = Blueprint('api', __name__)
+
+
+def json_response(payload, status=200):
+    """Build a JSON response using the fast serializer."""
+    return current_app.response_class(dumps(payload), status=status, mimetype='application/json')
+
+
+def cached_list_response(view):
+    """Cache successful JSON list responses and answer If-None-Match with 304.
+
+    Responses are keyed by path and query arguments, and tagged with a hash
+    of the body so polling clients can revalidate cheaply.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.path + '?' + urlencode(sorted(request.args.items(multi=True)))
+        cached = current_app.extensions['list_response_cache'].get(key)
+        if cached is not None:
+            body, etag = cached
+            response = current_app.response_class(body, mimetype='application/json')
+            response.set_etag(etag)
+        else:
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            response.set_etag(etag)
+            current_app.extensions['list_response_cache'].set(key, (body, etag))
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    return wrapper
+
+
+def clear_list_response_cache():
+    """Drop every response cached by cached_list_response for the current app."""
+    current_app.extensions['list_response_cache'].clear()
+
+
+def per_page_arg():
+    """Read the `per_page` query argument, clamped to the configured limits."""
+    config = current_app.config
+    per_page = request.args.get('per_page', config['DEFAULT_PAGE_SIZE'], type=int)
+    return max(1, min(per_page, config['MAX_PAGE_SIZE']))
+
+
+def hashing_busy_response():
+    """Response returned when the password hashing pool is saturated."""
+    response = jsonify({'error': 'Server busy, try again later'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+@api.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint."""
+    return jsonify({'status': 'healthy', 'version': '1.0.0'})
+
+
+@api.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Get connection pool, cache and hashing metrics."""
+    extensions = current_app.extensions
+    return jsonify({
+        'db_pool': pool_stats(db.engine),
+        'user_cache': UserService.cache_stats(),
+        'password_hashing': get_password_hasher().stats(),
+        'rate_limit': extensions['rate_limiter'].stats.to_dict(),
+        'concurrency': extensions['concurrency_limiter'].stats()
+    })
+
+
+@api.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Get request, query, pool and admission metrics in Prometheus text format."""
+    extensions = current_app.extensions
+    return current_app.response_class(
+        render_prometheus(db.engine) + render_admission_metrics(
+            extensions['rate_limiter'], extensions['concurrency_limiter']
+        ),
+        mimetype='text/plain; version=0.0.4'
+    )
+
+
+@api.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Get user cache hit/miss/eviction counters."""
+    return jsonify(UserService.cache_stats())
+
+
+@api.route('/api/hashing/stats', methods=['GET'])
+def hashing_stats():
+    """Get password hashing latency histograms."""
+    return jsonify(get_password_hasher().stats())
+
+
+@api.route('/api/login', methods=['POST'])
+def login():
+    """Verify a username and password."""
+    data = request.get_json()
+    
+    if not data or 'username' not in data or 'password' not in data:
+        return jsonify({'error': 'username and password are required'}), 400
+    
+    try:
+        user = UserService.authenticate(data['username'], data['password'])
+        if user is None:
+            return jsonify({'error': 'Invalid credentials'}), 401
+        return jsonify(user.to_dict())
+    except HashingBusyError:
+        return hashing_busy_response()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# Related data that listings can embed with ?include=
+USER_INCLUDES = ('posts_count', 'recent_posts')
+
+
+def parse_include():
+    """Parse the comma-separated `include` query argument."""
+    include = [i for i in request.args.get('include', '').split(',') if i]
+    unknown = [i for i in include if i not in USER_INCLUDES]
+    if unknown:
+        raise ValueError(f'Unknown include values: {unknown}')
+    return set(include)
+
+
+def users_to_dicts(rows, include, fields):
+    """Serialize user rows, loading included relations for the whole page at once."""
+    result = rows_to_dicts(rows, fields)
+    user_ids = [row.id for row in rows]
+    
+    if 'posts_count' in include:
+        counts = PostService.get_posts_counts(user_ids)
+        for data, user_id in zip(result, user_ids):
+            data['posts_count'] = counts[user_id]
+    
+    if 'recent_posts' in include:
+        recent = PostService.get_recent_posts(user_ids)
+        for data, user_id in zip(result, user_ids):
+            data['recent_posts'] = [post.to_dict() for post in recent[user_id]]
+    
+    return result
+
+
+@api.route('/api/users', methods=['GET'])
+@cached_list_response
+def get_users():
+    """Get all users with optional filtering.
+
+    Pass `after` (or `mode=cursor` for the first page) to use keyset
+    pagination instead of page numbers.
+    """
+    if 'after' in request.args or request.args.get('mode') == 'cursor':
+        return get_users_cursor()
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = per_page_arg()
+    
+    try:
+        include = parse_include()
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        users = UserService.get_all_users(
+            page=page,
+            per_page=per_page,
+            columns=user_columns(fields)
+        )
+        return json_response({
+            'users': users_to_dicts(users.items, include, fields),
+            'total': users.total,
+            'pages': users.pages,
+            'current_page': users.page
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def get_users_cursor():
+    """Get a page of users using an opaque `after` cursor."""
+    per_page = per_page_arg()
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+    
+    try:
+        include = parse_include()
+        fields = parse_fields(request.args.get('fields'))
+        users = UserService.get_users_after(
+            after=request.args.get('after') or None,
+            per_page=per_page,
+            order_by=request.args.get('order_by', 'id'),
+            include_total=include_total,
+            columns=user_columns(fields)
+        )
+        response = {
+            'users': users_to_dicts(users.items, include, fields),
+            'next': users.next_cursor,
+            'has_more': users.has_more,
+            'per_page': users.per_page
+        }
+        if include_total:
+            response['total'] = users.total
+        return json_response(response)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/api/users/search', methods=['GET'])
+def search_users():
+    """Search active users by username or email substring."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = per_page_arg()
+    
+    try:
+        users = UserService.search_users(query, page=page, per_page=per_page)
+        return jsonify({
+            'users': [user.to_dict() for user in users.items],
+            'total': users.total,
+            'pages': users.pages,
+            'current_page': users.page
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/api/users/batch', methods=['GET', 'POST'])
+def get_users_batch():
+    """Get many users by ID in one request.
+
+    Pass `ids` as a comma-separated query argument, or POST
+    {"ids": [...]} for long lists. Users come back in the order requested;
+    an ID with no user gets {"id": ..., "error": "User not found"}.
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        ids = data.get('ids')
+    else:
+        ids = [i for i in request.args.get('ids', '').split(',') if i.strip()]
+    
+    if not ids or not isinstance(ids, list):
+        return jsonify({'error': 'ids is required'}), 400
+    # Only JSON integers and digit strings; int() would also take true or 1.7
+    if not all(
+        (isinstance(i, int) and not isinstance(i, bool))
+        or (isinstance(i, str) and i.strip().isascii() and i.strip().isdigit())
+        for i in ids
+    ):
+        return jsonify({'error': 'ids must be integers'}), 400
+    ids = [int(i) for i in ids]
+    max_ids = current_app.config['USER_BATCH_MAX_IDS']
+    if len(ids) > max_ids:
+        return jsonify({'error': f'At most {max_ids} ids per request'}), 400
+    
+    try:
+        users = UserService.get_users_by_ids(ids)
+        return json_response({
+            'users': [
+                user.to_dict() if user is not None
+                else {'id': user_id, 'error': 'User not found'}
+                for user_id, user in zip(ids, users)
+            ],
+            'not_found': [user_id for user_id, user in zip(ids, users) if user is None]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/api/users/changes', methods=['GET'])
+def get_user_changes():
+    """Stream user changes after a sequence number as NDJSON.
+
+    Each line is one change: {"seq", "user_id", "op", "user", "created_at"}.
+    Clients pass the last seq they applied as `since` and call again until
+    the response is empty.
+    """
+    since = request.args.get('since', 0, type=int)
+    max_items = current_app.config['CHANGE_FEED_MAX_ITEMS']
+    limit = max(1, min(request.args.get('limit', max_items, type=int), max_items))
+    
+    def generate():
+        for change in UserService.iter_changes(since=since, limit=limit):
+            yield dumps(change) + b'\n'
+    
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype='application/x-ndjson'
+    )
+
+
+@api.route('/api/users/<int:user_id>', methods=['GET'])
+def get_user(user_id):
+    """Get a specific user by ID."""
+    try:
+        user = UserService.get_user_by_id(user_id)
+        if user is None:
+            return jsonify({'error': 'User not found'}), 404
+        response = jsonify(user.to_dict())
+        # The row's last update time identifies this version of the user
+        updated = user.updated_at.isoformat() if user.updated_at else ''
+        response.set_etag(f'{user.id}-{updated}', weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/api/users/<int:user_id>/posts', methods=['GET'])
+def get_user_posts(user_id):
+    """Get a user's posts, newest first."""
+    page = request.args.get('page', 1, type=int)
+    per_page = per_page_arg()
+    
+    try:
+        if UserService.get_user_by_id(user_id) is None:
+            return jsonify({'error': 'User not found'}), 404
+        posts = PostService.get_posts_for_user(user_id, page=page, per_page=per_page)
+        return jsonify({
+            'posts': [post.to_dict() for post in posts.items],
+            'total': posts.total,
+            'pages': posts.pages,
+            'current_page': posts.page
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/api/users', methods=['POST'])
+def create_user():
+    """Create a new user."""
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    required_fields = ['username', 'email']
+    missing = [f for f in required_fields if f not in data]
+    if missing:
+        return jsonify({'error': f'Missing fields: {missing}'}), 400
+    
+    try:
+        user = UserService.create_user(
+            username=data['username'],
+            email=data['email'],
+            password=data.get('password', 'default123')
+        )
+        return jsonify(user.to_dict()), 201
+    except HashingBusyError:
+        return hashing_busy_response()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/api/users/bulk', methods=['POST'])
+def create_users_bulk():
+    """Create many users from an NDJSON request body (one user per line)."""
+    try:
+        report = UserService.create_users_bulk(
+            request.stream,
+            batch_size=current_app.config['BULK_IMPORT_BATCH_SIZE']
+        )
+        return jsonify(report)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api.route('/api/users/<int:user_id>', methods=['PUT'])
+def update_user(user_id):
+    """Update an existing user."""
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    try:
+        user = UserService.update_user(user_id, data)
+        if user is None:
+            return jsonify({'error': 'User not found'}), 404
+        return jsonify(user.to_dict())
+    except HashingBusyError:
+        return hashing_busy_response()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# TODO: Ask Copilot with @workspace:
+# "How would I add a DELETE endpoint for users?"
+
+
+@api.app_errorhandler(404)
+def not_found(error):
+    """Handle 404 errors."""
+    return jsonify({'error': 'Resource not found'}), 404
+
+
+@api.app_errorhandler(500)
+def internal_error(error):
+    """Handle 500 errors."""
+    db.session.rollback()
+    return jsonify({'error': 'Internal server error'}), 500
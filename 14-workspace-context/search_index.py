@@ -0,0 +1,340 @@
+"""
+User Search Index
+=================
+Substring search over usernames and emails without table scans.
+
+`ILIKE '%q%'` cannot use a B-tree index, so every search reads the whole
+users table. This module keeps a separate index, which the service layer
+builds once and then keeps current from the user change log:
+
+- NgramIndex: an in-process trigram inverted index. A query is answered by
+  intersecting the posting sets of its trigrams and then confirming the
+  substring match on the few remaining candidates. Every 1- and
+  2-character substring is indexed too, so a short query is one lookup.
+- SqliteFtsIndex: the same interface backed by an SQLite FTS5 table with
+  the trigram tokenizer (SQLite 3.34+), optionally stored in a file.
+
+Both rank matches the same way: exact username, username prefix, email
+prefix, then any other substring match.
+
+Each index remembers `synced_seq`, the last change log seq it applied
+(None until it is built). `apply` only applies a batch read after the
+index's current seq, so processes sharing one FTS5 file never apply the
+same changes twice or out of order, and `load` only fills an index that
+has never been built.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:search_index.py How does the trigram index answer a query?"
+- "@workspace When is the search index updated?"
+"""
+
+import heapq
+import os
+import sqlite3
+import threading
+
+
+def _trigrams(text):
+    """Split text into its set of trigrams."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _grams(text):
+    """Split text into its set of 1-, 2- and 3-character substrings."""
+    return {text[i:i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)}
+
+
+def _rank(query, username, email):
+    """Rank a match; lower is better."""
+    if username == query:
+        return 0
+    if username.startswith(query):
+        return 1
+    if email.startswith(query):
+        return 2
+    return 3
+
+
+class NgramIndex:
+    """In-process trigram inverted index over usernames and emails."""
+
+    shared = False
+
+    def __init__(self):
+        self._docs = {}       # user_id -> (username, email), lowercased
+        self._postings = {}   # 1- to 3-character gram -> set of user_ids
+        self._lock = threading.RLock()
+        self.synced_seq = None
+
+    def add(self, user_id, username, email):
+        """Index a user, replacing any previous entry for the same ID."""
+        username = username.lower()
+        email = email.lower()
+        with self._lock:
+            if user_id in self._docs:
+                self.remove(user_id)
+            self._docs[user_id] = (username, email)
+            for gram in _grams(username) | _grams(email):
+                self._postings.setdefault(gram, set()).add(user_id)
+
+    def remove(self, user_id):
+        """Remove a user from the index."""
+        with self._lock:
+            doc = self._docs.pop(user_id, None)
+            if doc is None:
+                return
+            for gram in _grams(doc[0]) | _grams(doc[1]):
+                ids = self._postings.get(gram)
+                if ids is not None:
+                    ids.discard(user_id)
+                    if not ids:
+                        del self._postings[gram]
+
+    def clear(self):
+        """Remove every entry; the index counts as not built again."""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self.synced_seq = None
+
+    def load(self, users, seq):
+        """Build the index from (user_id, username, email) rows read at `seq`.
+
+        Does nothing if the index is already built.
+        """
+        with self._lock:
+            if self.synced_seq is not None:
+                return
+            for user_id, username, email in users:
+                self.add(user_id, username, email)
+            self.synced_seq = seq
+
+    def apply(self, changes, since, seq):
+        """Apply (user_id, (username, email) or None) changes after `since`.
+
+        A None document removes the user. Returns False without applying
+        anything unless the index is still at `since`.
+        """
+        with self._lock:
+            if self.synced_seq is None or self.synced_seq != since:
+                return False
+            for user_id, doc in changes:
+                if doc is None:
+                    self.remove(user_id)
+                else:
+                    self.add(user_id, *doc)
+            self.synced_seq = seq
+            return True
+
+    def _candidates(self, query):
+        """Get user IDs that may contain the query."""
+        if len(query) < 3:
+            # Short grams are indexed directly; every ID here is a match
+            return self._postings.get(query, set())
+        grams = sorted((self._postings.get(g, set()) for g in _trigrams(query)), key=len)
+        result = set(grams[0])
+        for ids in grams[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def search(self, query, limit=10, offset=0):
+        """Find users whose username or email contains `query`.
+
+        Returns a tuple of (ranked user IDs for the requested page, total
+        number of matches).
+        """
+        query = query.lower()
+        if not query:
+            return [], 0
+        total = 0
+
+        def matches():
+            nonlocal total
+            for user_id in candidates:
+                username, email = docs[user_id]
+                if query in username or query in email:
+                    total += 1
+                    yield _rank(query, username, email), len(username), user_id
+
+        with self._lock:
+            docs = self._docs
+            candidates = self._candidates(query)
+            # Only the requested page and the ones before it are kept in order
+            page = heapq.nsmallest(offset + limit, matches())
+        return [m[2] for m in page[offset:]], total
+
+    def __len__(self):
+        return len(self._docs)
+
+
+class SqliteFtsIndex:
+    """Search index backed by an SQLite FTS5 trigram table.
+
+    A file-backed index can be shared by several worker processes. Each
+    process opens its own connection (connections must not cross a fork)
+    and the last applied change log seq is stored in the file itself.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.shared = path != ':memory:'
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        """Get this process's connection, opening it on first use."""
+        if self._pid != os.getpid():
+            # Autocommit mode, so transactions are started explicitly
+            conn = sqlite3.connect(self.path, check_same_thread=False,
+                                   isolation_level=None, timeout=30)
+            if self.shared:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS user_search "
+                "USING fts5(username, email, tokenize='trigram')"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_search_state "
+                "(id INTEGER PRIMARY KEY CHECK (id = 1), synced_seq INTEGER NOT NULL)"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _synced_seq(conn):
+        row = conn.execute("SELECT synced_seq FROM user_search_state").fetchone()
+        return row[0] if row else None
+
+    @property
+    def synced_seq(self):
+        """Last change log seq applied, or None if the index is not built."""
+        with self._lock:
+            return self._synced_seq(self._connection())
+
+    @staticmethod
+    def _add(conn, user_id, username, email):
+        conn.execute("DELETE FROM user_search WHERE rowid = ?", (user_id,))
+        conn.execute(
+            "INSERT INTO user_search (rowid, username, email) VALUES (?, ?, ?)",
+            (user_id, username.lower(), email.lower())
+        )
+
+    def add(self, user_id, username, email):
+        """Index a user, replacing any previous entry for the same ID."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._add(conn, user_id, username, email)
+
+    def remove(self, user_id):
+        """Remove a user from the index."""
+        with self._lock:
+            self._connection().execute("DELETE FROM user_search WHERE rowid = ?", (user_id,))
+
+    def clear(self):
+        """Remove every entry; the index counts as not built again."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM user_search")
+                conn.execute("DELETE FROM user_search_state")
+
+    def load(self, users, seq):
+        """Build the index from (user_id, username, email) rows read at `seq`.
+
+        Does nothing if the index is already built, e.g. by another
+        process sharing the file.
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                # Takes the write lock, so only one process builds the file
+                conn.execute("BEGIN IMMEDIATE")
+                if self._synced_seq(conn) is not None:
+                    return
+                conn.execute("DELETE FROM user_search")
+                for user_id, username, email in users:
+                    self._add(conn, user_id, username, email)
+                conn.execute(
+                    "INSERT INTO user_search_state (id, synced_seq) VALUES (1, ?)", (seq,)
+                )
+
+    def apply(self, changes, since, seq):
+        """Apply (user_id, (username, email) or None) changes after `since`.
+
+        A None document removes the user. Returns False without applying
+        anything unless the index is still at `since`; another process may
+        have applied the same changes already.
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if self._synced_seq(conn) != since or since is None:
+                    return False
+                for user_id, doc in changes:
+                    if doc is None:
+                        conn.execute("DELETE FROM user_search WHERE rowid = ?", (user_id,))
+                    else:
+                        self._add(conn, user_id, *doc)
+                conn.execute("UPDATE user_search_state SET synced_seq = ?", (seq,))
+                return True
+
+    def search(self, query, limit=10, offset=0):
+        """Find users whose username or email contains `query`.
+
+        Returns a tuple of (ranked user IDs for the requested page, total
+        number of matches).
+        """
+        query = query.lower()
+        if not query:
+            return [], 0
+
+        if len(query) >= 3:
+            # The trigram tokenizer turns a quoted phrase into a substring match
+            where = "user_search MATCH ?"
+            param = '"' + query.replace('"', '""') + '"'
+        else:
+            escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            where = ("(username LIKE ? ESCAPE '\\' OR email LIKE ? ESCAPE '\\')")
+            param = f'%{escaped}%'
+        params = (param,) if len(query) >= 3 else (param, param)
+
+        order = (
+            "CASE WHEN username = ? THEN 0 "
+            "WHEN substr(username, 1, length(?)) = ? THEN 1 "
+            "WHEN substr(email, 1, length(?)) = ? THEN 2 "
+            "ELSE 3 END, length(username), rowid"
+        )
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute(
+                f"SELECT count(*) FROM user_search WHERE {where}", params
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT rowid FROM user_search WHERE {where} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                params + (query,) * 5 + (limit, offset)
+            ).fetchall()
+        return [row[0] for row in rows], total
+
+    def __len__(self):
+        with self._lock:
+            return self._connection().execute(
+                "SELECT count(*) FROM user_search"
+            ).fetchone()[0]
+
+
+def create_search_index(backend='ngram', path=':memory:'):
+    """Create a search index for the given backend name ('ngram' or 'fts5')."""
+    if backend == 'ngram':
+        return NgramIndex()
+    if backend == 'fts5':
+        return SqliteFtsIndex(path)
+    raise ValueError(f"Unknown search index backend: {backend}")
@@ -0,0 +1,118 @@
+"""
+Serializers
+===========
+Fast serialization of query rows into JSON responses.
+
+Listing endpoints don't need full ORM objects: hydrating a User, calling
+`to_dict()` and letting `jsonify` walk the result again costs more CPU than
+the query itself on large pages. Instead, listings select only the columns
+they need as plain row tuples, turn them into dicts directly, and encode
+with the fastest JSON backend available.
+
+Clients can ask for a sparse fieldset with `?fields=id,username`.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:serializers.py How would I add another JSON backend?"
+- "@workspace Where is the `fields` query argument handled?"
+"""
+
+import json
+from datetime import date, datetime
+
+from models import User
+
+
+# Fields a client may request; mirrors User.to_dict()
+USER_FIELDS = ('id', 'username', 'email', 'is_active', 'created_at', 'updated_at')
+
+# Always selected, because pagination cursors and includes depend on them
+_REQUIRED_USER_FIELDS = ('id', 'created_at')
+
+
+def parse_fields(value, allowed=USER_FIELDS):
+    """Parse a comma-separated fieldset; None or '' means all fields."""
+    if not value:
+        return allowed
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f'Unknown fields: {unknown}')
+    return fields
+
+
+def user_columns(fields):
+    """Get the User columns to select for a fieldset."""
+    names = dict.fromkeys(_REQUIRED_USER_FIELDS + tuple(fields))
+    return [getattr(User, name) for name in names]
+
+
+def rows_to_dicts(rows, fields):
+    """Convert row tuples to dicts holding only `fields`."""
+    result = []
+    for row in rows:
+        mapping = row._mapping
+        item = {}
+        for name in fields:
+            value = mapping[name]
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            item[name] = value
+        result.append(item)
+    return result
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+# One encoder is reused for every response instead of being rebuilt per call
+_stdlib_encoder = json.JSONEncoder(
+    ensure_ascii=False, separators=(',', ':'), default=_default
+)
+
+
+def _dumps_stdlib(payload):
+    return _stdlib_encoder.encode(payload).encode('utf-8')
+
+
+def _load_orjson():
+    import orjson
+
+    def dumps(payload):
+        return orjson.dumps(payload, default=_default)
+    return dumps
+
+
+JSON_BACKENDS = {
+    'json': lambda: _dumps_stdlib,
+    'orjson': _load_orjson,
+}
+
+_dumps = _dumps_stdlib
+json_backend = 'json'
+
+
+def configure_json_backend(name='auto'):
+    """Select the JSON encoder; 'auto' prefers orjson when it is installed."""
+    global _dumps, json_backend
+    if name == 'auto':
+        for candidate in ('orjson', 'json'):
+            try:
+                _dumps = JSON_BACKENDS[candidate]()
+            except ImportError:
+                continue
+            json_backend = candidate
+            return json_backend
+    if name not in JSON_BACKENDS:
+        raise ValueError(f'Unknown JSON backend: {name}')
+    _dumps = JSON_BACKENDS[name]()
+    json_backend = name
+    return json_backend
+
+
+def dumps(payload):
+    """Encode a payload to JSON bytes with the configured backend."""
+    return _dumps(payload)
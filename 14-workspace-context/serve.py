@@ -0,0 +1,207 @@
+"""
+Production Server
+=================
+Runs the app under gunicorn with a pre-forking pool of workers, using the
+settings of ProductionConfig (or whichever FLASK_ENV selects).
+
+    python serve.py           # start: migrate, preload, fork WEB_WORKERS workers
+    python serve.py reload    # zero-downtime reload of code and settings
+
+Needs gunicorn (`pip install gunicorn`), which runs on Unix only.
+
+How it runs:
+- Preloading: the master process builds the app once and then forks its
+  workers. Workers share the already-imported code copy-on-write, so
+  they start fast and use less memory than workers that each import
+  the app themselves.
+- Per-worker database pools: the master's connections (it runs the
+  migrations) are inherited by every fork. Two processes must never
+  share one connection, so each worker discards the inherited pool
+  right after fork and opens its own connections on demand.
+- Graceful reload: with preloading, SIGHUP would restart workers from
+  the master's old code. `reload` instead sends USR2, which starts a
+  new master running the current code next to the old one on the same
+  socket. Once the new workers are up, it sends TERM to the old master,
+  whose workers finish their in-flight requests (up to
+  WEB_GRACEFUL_TIMEOUT) before exiting. No request is refused.
+
+State across workers:
+- User and list response caches must be shared or off, or a worker
+  would keep serving users another worker has changed. ProductionConfig
+  turns them off. With more than one worker, serve.py refuses to start
+  with a per-process cache ('memory', or 'remote' without REDIS_URL).
+  Set USER_CACHE_BACKEND / RESPONSE_CACHE_BACKEND=remote and REDIS_URL
+  to share them.
+- The search index can stay per worker: before each search it applies
+  the user change log, which records every worker's writes.
+- Rate limiter buckets and metrics are per worker unless
+  RATE_LIMIT_BACKEND=remote with REDIS_URL; per worker, a client can get
+  up to WEB_WORKERS times its limit.
+
+Size the database for WEB_WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+connections.
+
+Compare throughput with the development server using
+benchmarks/bench_server.py.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:serve.py Why must each worker dispose of the inherited connection pool?"
+- "@workspace How many database connections can production open?"
+"""
+
+import os
+import signal
+import sys
+import time
+
+from app import load_environment
+
+_flask_app = None
+
+
+def build_app():
+    """Create the app in the master, migrate it and build the search index."""
+    global _flask_app
+    from app import create_app
+    from migrations import upgrade
+    from models import db
+    from services import UserService
+
+    _flask_app = create_app(os.environ['FLASK_ENV'])
+    with _flask_app.app_context():
+        upgrade(db.engine)
+        UserService.sync_search_index()
+        db.session.remove()
+    return _flask_app
+
+
+def post_fork(server, worker):
+    """Drop the database connections copied from the master.
+
+    dispose(close=False) forgets the inherited connections without
+    closing them, since the sockets still belong to the master.
+    """
+    from models import db
+
+    with _flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def per_process_caches(settings):
+    """Cache settings that would give each worker its own, unshared copy."""
+    unshared = []
+    if settings.WEB_WORKERS <= 1:
+        return unshared
+    for name in ('USER_CACHE_BACKEND', 'RESPONSE_CACHE_BACKEND'):
+        backend = getattr(settings, name)
+        if backend == 'memory' or (backend == 'remote' and not settings.REDIS_URL):
+            unshared.append(f'{name}={backend}')
+    return unshared
+
+
+def gunicorn_options(settings):
+    """Gunicorn settings derived from an app configuration class."""
+    return {
+        'bind': f'{settings.HOST}:{settings.PORT}',
+        'workers': settings.WEB_WORKERS,
+        'worker_class': 'gthread',
+        'threads': settings.WEB_THREADS,
+        'timeout': settings.WEB_TIMEOUT,
+        'graceful_timeout': settings.WEB_GRACEFUL_TIMEOUT,
+        'max_requests': settings.WEB_MAX_REQUESTS,
+        'max_requests_jitter': settings.WEB_MAX_REQUESTS // 10,
+        'pidfile': settings.WEB_PIDFILE,
+        'preload_app': True,
+        'post_fork': post_fork,
+    }
+
+
+def _read_pid(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0) or None
+    except (OSError, ValueError):
+        return None
+
+
+def _child_count(pid):
+    """Count the processes whose parent is `pid` (Linux /proc)."""
+    count = 0
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The fields after the ")" closing the command name: state, ppid, ...
+                if int(f.read().rsplit(')', 1)[1].split()[1]) == pid:
+                    count += 1
+        except (OSError, IndexError, ValueError):
+            continue
+    return count
+
+
+def reload(settings):
+    """Replace the running server with a new master without dropping requests."""
+    old_pid = _read_pid(settings.WEB_PIDFILE)
+    if old_pid is None:
+        print(f"No running server found (pidfile {settings.WEB_PIDFILE})")
+        return 1
+
+    os.kill(old_pid, signal.SIGUSR2)
+    # The new master writes "<pidfile>.2" and takes over the pidfile
+    # itself once the old master has exited
+    deadline = time.monotonic() + settings.WEB_TIMEOUT
+    while time.monotonic() < deadline:
+        new_pid = _read_pid(settings.WEB_PIDFILE + '.2')
+        if new_pid and new_pid != old_pid:
+            if not os.path.isdir('/proc'):
+                time.sleep(5)  # no way to count workers; give them time to boot
+                break
+            if _child_count(new_pid) >= settings.WEB_WORKERS:
+                break
+        time.sleep(0.2)
+    else:
+        print("New server did not start in time; the old server keeps running")
+        return 1
+
+    os.kill(old_pid, signal.SIGTERM)
+    print(f"Reloaded: master {old_pid} is draining, master {new_pid} is serving")
+    return 0
+
+
+def main(argv):
+    load_environment()
+    os.environ.setdefault('FLASK_ENV', 'production')
+    from config import get_config
+
+    settings = get_config()
+    if argv[1:] == ['reload']:
+        return reload(settings)
+    if argv[1:]:
+        print("usage: python serve.py [reload]")
+        return 2
+    unshared = per_process_caches(settings)
+    if unshared:
+        print(f"Refusing to start {settings.WEB_WORKERS} workers with per-process caches "
+              f"({', '.join(unshared)}): use 'none', or 'remote' with REDIS_URL",
+              file=sys.stderr)
+        return 1
+
+    from gunicorn.app.base import BaseApplication
+
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options(settings).items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return build_app()
+
+    ProductionServer().run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -9,9 +9,205 @@ Open Copilot Chat and ask:
 - "#file:services.py #file:app.py How is error handling done?"
 """
 
-from models import User, db
+from models import Post, User, UserChange, db
+from cache import LRUCache
+from changelog import record_user_changes
+from hashing import get_password_hasher
+from pagination import CachedCount, IndexPage, keyset_paginate
+from search_index import NgramIndex
+from sqlalchemy import func, or_, select
 from sqlalchemy.exc import IntegrityError
-import re
+from sqlalchemy.orm import make_transient_to_detached
+import json
+import threading
+import validation
+import weakref
+
+
+# Total active users for page and cursor listings; the strategy (exact,
+# cached or write-maintained) is set by UserService.configure_count_strategy
+_active_user_count = CachedCount(ttl_seconds=30)
+
+# Read-through cache for single-user lookups (see UserService.configure_cache)
+_user_cache = LRUCache()
+
+
+def _user_cache_keys(user):
+    """Cache keys under which a user can be looked up."""
+    return [
+        f'user:id:{user.id}',
+        f'user:email:{user.email}',
+        f'user:username:{user.username}',
+    ]
+
+
+# Never cached: credentials are always checked against the database
+_UNCACHED_USER_COLUMNS = frozenset({'password_hash'})
+
+
+def _cache_user(user):
+    """Store a column snapshot of the user under all of its lookup keys.
+
+    The password hash is left out; a cached user loads it from the
+    database if it is ever read.
+    """
+    snapshot = {
+        attr.key: getattr(user, attr.key)
+        for attr in User.__mapper__.column_attrs
+        if attr.key not in _UNCACHED_USER_COLUMNS
+    }
+    for key in _user_cache_keys(user):
+        _user_cache.set(key, snapshot)
+
+
+def _get_cached_user(key):
+    """Rebuild a cached user and attach it to the current session.
+
+    The snapshot is merged with load=False, so no SELECT is emitted and the
+    returned instance can be modified and committed like a queried one.
+    """
+    snapshot = _user_cache.get(key)
+    if snapshot is None:
+        return None
+    return _user_from_snapshot(snapshot)
+
+
+def _user_from_snapshot(snapshot):
+    """Attach a User built from a cached column snapshot to the session."""
+    user = User.__mapper__.class_manager.new_instance()
+    for attr_name, value in snapshot.items():
+        setattr(user, attr_name, value)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+# Substring search index over active users (see UserService.configure_search_index).
+# It follows the user change log, so writes made by other processes are
+# searchable too.
+_search_index = NgramIndex()
+_search_index_lock = threading.Lock()
+
+
+def _search_doc(op, payload):
+    """Get the (username, email) a change leaves in the index, or None."""
+    if op == 'delete':
+        return None
+    user = json.loads(payload)
+    if not user.get('is_active'):
+        return None
+    return user['username'], user['email']
+
+
+def _build_search_index(index):
+    """Load every active user into an index that has never been built."""
+    # Read the log position first: changes committed while the users are
+    # read are then applied again afterwards, which is harmless
+    seq = db.session.query(func.coalesce(func.max(UserChange.seq), 0)).scalar()
+    rows = db.session.query(User.id, User.username, User.email).filter_by(
+        is_active=True
+    ).yield_per(10000)
+    index.load(rows, seq)
+
+
+def _sync_search_index(batch_size=10000):
+    """Build the search index if needed and apply newer change log entries."""
+    with _search_index_lock:
+        index = _search_index
+        if index.synced_seq is None:
+            _build_search_index(index)
+        while True:
+            since = index.synced_seq
+            changes = db.session.query(
+                UserChange.seq, UserChange.user_id, UserChange.op, UserChange.payload
+            ).filter(UserChange.seq > since).order_by(UserChange.seq).limit(batch_size).all()
+            if not changes:
+                return
+            # If another process sharing the index got there first, this
+            # is a no-op and the next batch starts from its position
+            index.apply(
+                [(user_id, _search_doc(op, payload)) for _, user_id, op, payload in changes],
+                since, changes[-1].seq
+            )
+
+
+def conflict_from_error(error):
+    """Get the unique field named by an IntegrityError's message, if any.
+
+    The database error message names the violated constraint on SQLite,
+    PostgreSQL and MySQL. Returns 'username', 'email' or None if the
+    message mentions neither or both.
+    """
+    message = str(getattr(error, 'orig', error)).lower()
+    named = [field for field in ('username', 'email') if field in message]
+    return named[0] if len(named) == 1 else None
+
+
+def conflict_query(username=None, email=None, exclude_id=None):
+    """Build one query that finds users holding a username or email."""
+    conditions = []
+    if username is not None:
+        conditions.append(User.username == username)
+    if email is not None:
+        conditions.append(User.email == email)
+    if not conditions:
+        return None
+    query = select(User.username, User.email).where(or_(*conditions))
+    if exclude_id is not None:
+        query = query.where(User.id != exclude_id)
+    return query
+
+
+def conflict_from_rows(rows, username=None, email=None):
+    """Pick the conflicting field from the rows returned by conflict_query."""
+    for existing_username, existing_email in rows:
+        if username is not None and existing_username == username:
+            return 'username'
+        if email is not None and existing_email == email:
+            return 'email'
+    return None
+
+
+def _conflicting_field(error, username=None, email=None, exclude_id=None):
+    """Work out which unique field an IntegrityError was raised for.
+
+    Uses the error message when it is unambiguous, otherwise one query.
+    """
+    field = conflict_from_error(error)
+    if field is not None:
+        return field
+    query = conflict_query(username, email, exclude_id)
+    if query is None:
+        return None
+    return conflict_from_rows(db.session.execute(query), username, email)
+
+
+CONFLICT_MESSAGES = {
+    'username': "Username already exists",
+    'email': "Email already exists",
+}
+
+
+# Callbacks run after any user write, by owner (see UserService.add_change_listener).
+# Weakly keyed, so a discarded app's listener goes away with it.
+_change_listeners = weakref.WeakKeyDictionary()
+
+
+def _notify_user_change():
+    """Tell listeners that user data has changed."""
+    for listener in list(_change_listeners.values()):
+        listener()
+
+
+def _invalidate_user(*key_lists):
+    """Drop cached entries for the given lists of keys."""
+    _user_cache.delete(*[key for keys in key_lists for key in keys])
+    _notify_user_change()
+
+
+def _adjust_active_count(delta):
+    """Tell the active-user count strategy that users were added or removed."""
+    if delta:
+        _active_user_count.adjust(delta)
 
 
 class UserService:
@@ -20,43 +216,167 @@ class UserService:
     @staticmethod
     def validate_email(email):
         """Validate email format."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return validation.validate_email(email)
     
     @staticmethod
     def validate_username(username):
         """Validate username format."""
-        if len(username) < 3:
-            return False, "Username must be at least 3 characters"
-        if len(username) > 80:
-            return False, "Username must be less than 80 characters"
-        if not re.match(r'^[a-zA-Z0-9_]+$', username):
-            return False, "Username can only contain letters, numbers, and underscores"
-        return True, None
-    
-    @staticmethod
-    def get_all_users(page=1, per_page=10):
-        """Get all users with pagination."""
-        return User.query.filter_by(is_active=True).paginate(
+        return validation.validate_username(username)
+    
+    @staticmethod
+    def _active_users_query(columns=None):
+        """Query active users, as ORM objects or as rows of `columns`."""
+        query = User.query if columns is None else db.session.query(*columns)
+        return query.filter(User.is_active == True)  # noqa: E712
+    
+    @staticmethod
+    def get_all_users(page=1, per_page=10, columns=None):
+        """Get all users with pagination.
+
+        Pass `columns` to get lightweight row tuples instead of User objects.
+        """
+        users = UserService._active_users_query(columns).order_by(User.id).paginate(
             page=page,
             per_page=per_page,
-            error_out=False
+            error_out=False,
+            count=False
+        )
+        users.total = UserService.count_active_users()
+        return users
+    
+    @staticmethod
+    def get_users_after(after=None, per_page=10, order_by='id', include_total=False,
+                        columns=None):
+        """Get active users with keyset (cursor) pagination.
+
+        Unlike `get_all_users`, this never issues an OFFSET query, and the
+        total is only computed on request - from a short-lived cached count.
+        `columns` must include the ordering columns when given.
+        """
+        query = UserService._active_users_query(columns)
+        page = keyset_paginate(query, User, after=after, per_page=per_page,
+                               order_by=order_by)
+        if include_total:
+            page.total = UserService.count_active_users()
+        return page
+    
+    @staticmethod
+    def count_active_users():
+        """Count active users using the configured count strategy."""
+        return _active_user_count.get(
+            lambda: db.session.query(func.count(User.id)).filter(
+                User.is_active == True  # noqa: E712
+            ).scalar()
         )
     
+    @staticmethod
+    def configure_count_strategy(strategy):
+        """Replace how listing totals are counted (see pagination.create_count_strategy)."""
+        global _active_user_count
+        _active_user_count = strategy
+    
+    @staticmethod
+    def configure_cache(cache):
+        """Replace the cache used for single-user lookups.
+
+        Returns the cache it replaced, so callers can put it back.
+        """
+        global _user_cache
+        previous, _user_cache = _user_cache, cache
+        return previous
+    
+    @staticmethod
+    def cache_stats():
+        """Get hit/miss/eviction counters for the user cache."""
+        return _user_cache.stats.to_dict()
+    
+    @staticmethod
+    def add_change_listener(owner, listener):
+        """Register a callback to run after users are created, updated or deleted.
+
+        `owner` (e.g. the Flask app) has at most one listener; registering
+        again replaces it. The listener is dropped when the owner is
+        garbage collected or passed to remove_change_listener.
+        """
+        _change_listeners[owner] = listener
+    
+    @staticmethod
+    def remove_change_listener(owner):
+        """Unregister the listener added for `owner`, if any."""
+        _change_listeners.pop(owner, None)
+    
+    @staticmethod
+    def configure_search_index(index):
+        """Replace the search index; it is built on the next search if empty."""
+        global _search_index
+        with _search_index_lock:
+            _search_index = index
+    
+    @staticmethod
+    def sync_search_index():
+        """Build the search index if needed and apply newer user changes.
+
+        Searches do this themselves. Calling it before workers fork builds
+        an in-process index once, shared copy-on-write.
+        """
+        _sync_search_index()
+    
     @staticmethod
     def get_user_by_id(user_id):
         """Get a user by their ID."""
-        return User.query.get(user_id)
+        user = _get_cached_user(f'user:id:{user_id}')
+        if user is None:
+            user = User.query.get(user_id)
+            if user is not None:
+                _cache_user(user)
+        return user
+    
+    @staticmethod
+    def get_users_by_ids(user_ids, chunk_size=500):
+        """Get many users by ID, in the order requested.
+
+        The result has one entry per requested ID, with None where no user
+        exists. Cached users come from one multi-key cache read, and the
+        rest are loaded with an IN query (one per `chunk_size` IDs).
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        snapshots = _user_cache.get_many([f'user:id:{user_id}' for user_id in unique_ids])
+        found = {}
+        missing = []
+        for user_id in unique_ids:
+            snapshot = snapshots.get(f'user:id:{user_id}')
+            if snapshot is None:
+                missing.append(user_id)
+            else:
+                found[user_id] = _user_from_snapshot(snapshot)
+        
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start:start + chunk_size]
+            for user in User.query.filter(User.id.in_(chunk)):
+                found[user.id] = user
+                _cache_user(user)
+        
+        return [found.get(user_id) for user_id in user_ids]
     
     @staticmethod
     def get_user_by_email(email):
         """Get a user by their email."""
-        return User.query.filter_by(email=email).first()
+        user = _get_cached_user(f'user:email:{email}')
+        if user is None:
+            user = User.query.filter_by(email=email).first()
+            if user is not None:
+                _cache_user(user)
+        return user
     
     @staticmethod
     def get_user_by_username(username):
         """Get a user by their username."""
-        return User.query.filter_by(username=username).first()
+        user = _get_cached_user(f'user:username:{username}')
+        if user is None:
+            user = User.query.filter_by(username=username).first()
+            if user is not None:
+                _cache_user(user)
+        return user
     
     @staticmethod
     def create_user(username, email, password):
@@ -70,23 +390,174 @@ class UserService:
         if not UserService.validate_email(email):
             raise ValueError("Invalid email format")
         
-        # Check if username already exists
-        if UserService.get_user_by_username(username):
-            raise ValueError("Username already exists")
-        
-        # Check if email already exists
-        if UserService.get_user_by_email(email):
-            raise ValueError("Email already exists")
-        
-        # Create and save user
+        # Create and save user. Uniqueness is enforced by the database's
+        # unique constraints, so the happy path is a single INSERT.
         try:
             user = User(username=username, email=email, password=password)
             db.session.add(user)
+            db.session.flush()
+            keys = _user_cache_keys(user)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            field = _conflicting_field(e, username=username, email=email)
+            raise ValueError(CONFLICT_MESSAGES.get(field, "Could not create user"))
+        
+        _invalidate_user(keys)
+        _adjust_active_count(1)
+        return user
+    
+    @staticmethod
+    def create_users_bulk(lines, batch_size=1000):
+        """Create users from an NDJSON stream.
+
+        Each line is a JSON object with `username`, `email` and an optional
+        `password`. Lines are validated and inserted in batches: one query
+        per batch checks for existing usernames/emails, and valid rows are
+        inserted with a single executemany. Returns a report with the number
+        of users created and a list of per-line errors.
+        """
+        report = {'created': 0, 'failed': 0, 'errors': []}
+        batch = []
+        
+        for line_no, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                UserService._bulk_error(report, line_no, "Invalid JSON")
+                continue
+            batch.append((line_no, record))
+            if len(batch) >= batch_size:
+                UserService._insert_batch(batch, report)
+                batch = []
+        
+        if batch:
+            UserService._insert_batch(batch, report)
+        report['errors'].sort(key=lambda e: e['line'])
+        return report
+    
+    @staticmethod
+    def _bulk_error(report, line_no, error):
+        """Record a failed line in a bulk import report."""
+        report['failed'] += 1
+        report['errors'].append({'line': line_no, 'error': error})
+    
+    @staticmethod
+    def _insert_batch(batch, report):
+        """Validate, de-duplicate and insert one batch of bulk records."""
+        valid = []
+        errors = validation.validate_many(record for _, record in batch)
+        for (line_no, record), error in zip(batch, errors):
+            if error:
+                UserService._bulk_error(report, line_no, error)
+            else:
+                valid.append((line_no, record))
+        if not valid:
+            return
+        
+        # One set-based query finds every collision with existing users
+        usernames = {record['username'] for _, record in valid}
+        emails = {record['email'] for _, record in valid}
+        taken_usernames = set()
+        taken_emails = set()
+        existing = db.session.query(User.username, User.email).filter(
+            User.username.in_(usernames) | User.email.in_(emails)
+        )
+        for username, email in existing:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+        
+        rows = []
+        for line_no, record in valid:
+            if record['username'] in taken_usernames:
+                UserService._bulk_error(report, line_no, "Username already exists")
+                continue
+            if record['email'] in taken_emails:
+                UserService._bulk_error(report, line_no, "Email already exists")
+                continue
+            # Later lines in the same batch collide with earlier ones
+            taken_usernames.add(record['username'])
+            taken_emails.add(record['email'])
+            rows.append((line_no, {
+                'username': record['username'],
+                'email': record['email'],
+            }, record.get('password', 'default123')))
+        if not rows:
+            return
+        
+        # Hash the whole batch in parallel on the worker pool
+        hashes = get_password_hasher().hash_many(password for _, _, password in rows)
+        for (_, row, _), password_hash in zip(rows, hashes):
+            row['password_hash'] = password_hash
+        rows = [(line_no, row) for line_no, row, _ in rows]
+        
+        inserted = []
+        try:
+            db.session.execute(User.__table__.insert(), [row for _, row in rows])
+            inserted = UserService._log_bulk_creates([row['username'] for _, row in rows])
             db.session.commit()
-            return user
+            report['created'] += len(rows)
         except IntegrityError:
+            # A concurrent writer took one of the names; retry row by row
+            # so only the conflicting lines are reported.
             db.session.rollback()
-            raise ValueError("Could not create user")
+            inserted = []
+            for line_no, row in rows:
+                try:
+                    db.session.execute(User.__table__.insert(), [row])
+                    created = UserService._log_bulk_creates([row['username']])
+                    db.session.commit()
+                    inserted += created
+                    report['created'] += 1
+                except IntegrityError as e:
+                    db.session.rollback()
+                    field = _conflicting_field(
+                        e, username=row['username'], email=row['email']
+                    )
+                    UserService._bulk_error(
+                        report, line_no,
+                        CONFLICT_MESSAGES.get(field, "Could not create user")
+                    )
+        
+        _notify_user_change()
+        _adjust_active_count(len(inserted))
+    
+    @staticmethod
+    def _log_bulk_creates(usernames):
+        """Write change log rows for users just inserted with executemany.
+
+        executemany does not return generated IDs, so the new users are
+        read back once. Returns (id, username, email) for each user.
+        """
+        users = User.query.filter(User.username.in_(usernames)).all()
+        record_user_changes(db.session.connection(), [('create', user) for user in users])
+        return [(user.id, user.username, user.email) for user in users]
+    
+    @staticmethod
+    def authenticate(username, password):
+        """Check a user's credentials.
+
+        Returns the user on success, otherwise None. If the stored hash was
+        made with an outdated cost factor it is transparently upgraded.
+        The user is always read from the database, never from the cache,
+        so a password changed by another process takes effect at once.
+        """
+        user = User.query.filter_by(username=username).execution_options(
+            populate_existing=True
+        ).first()
+        if user is None or not user.is_active or not user.check_password(password):
+            return None
+        
+        if get_password_hasher().needs_rehash(user.password_hash):
+            user.set_password(password)
+            db.session.commit()
+            _invalidate_user(_user_cache_keys(user))
+        return user
     
     @staticmethod
     def update_user(user_id, data):
@@ -94,23 +565,20 @@ class UserService:
         user = UserService.get_user_by_id(user_id)
         if not user:
             return None
+        old_keys = _user_cache_keys(user)
+        was_active = bool(user.is_active)
         
-        # Update allowed fields
+        # Update allowed fields. Username/email uniqueness is left to the
+        # database's unique constraints instead of pre-check queries.
         if 'username' in data:
             is_valid, error = UserService.validate_username(data['username'])
             if not is_valid:
                 raise ValueError(error)
-            existing = UserService.get_user_by_username(data['username'])
-            if existing and existing.id != user_id:
-                raise ValueError("Username already exists")
             user.username = data['username']
         
         if 'email' in data:
             if not UserService.validate_email(data['email']):
                 raise ValueError("Invalid email format")
-            existing = UserService.get_user_by_email(data['email'])
-            if existing and existing.id != user_id:
-                raise ValueError("Email already exists")
             user.email = data['email']
         
         if 'password' in data:
@@ -120,11 +588,24 @@ class UserService:
             user.is_active = data['is_active']
         
         try:
+            db.session.flush()
+            new_keys = _user_cache_keys(user)
+            is_active = bool(user.is_active)
             db.session.commit()
-            return user
-        except IntegrityError:
+        except IntegrityError as e:
             db.session.rollback()
-            raise ValueError("Could not update user")
+            _invalidate_user(old_keys)
+            field = _conflicting_field(
+                e,
+                username=data.get('username'),
+                email=data.get('email'),
+                exclude_id=user_id
+            )
+            raise ValueError(CONFLICT_MESSAGES.get(field, "Could not update user"))
+        
+        _invalidate_user(old_keys, new_keys)
+        _adjust_active_count(int(is_active) - int(was_active))
+        return user
     
     @staticmethod
     def delete_user(user_id, soft_delete=True):
@@ -133,6 +614,8 @@ class UserService:
         if not user:
             return False
         
+        keys = _user_cache_keys(user)
+        was_active = bool(user.is_active)
         if soft_delete:
             user.is_active = False
             db.session.commit()
@@ -140,20 +623,101 @@ class UserService:
             db.session.delete(user)
             db.session.commit()
         
+        _invalidate_user(keys)
+        _adjust_active_count(-int(was_active))
         return True
     
+    @staticmethod
+    def iter_changes(since=0, limit=None, batch_size=1000):
+        """Yield change log entries with seq greater than `since`, oldest first.
+
+        Reads in keyset batches so a long feed never loads the whole table.
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            changes = UserChange.query.filter(UserChange.seq > since).order_by(
+                UserChange.seq
+            ).limit(size).all()
+            for change in changes:
+                yield change.to_dict()
+            if len(changes) < size:
+                return
+            since = changes[-1].seq
+            if remaining is not None:
+                remaining -= len(changes)
+    
     @staticmethod
     def search_users(query, page=1, per_page=10):
-        """Search users by username or email."""
-        search_pattern = f"%{query}%"
-        return User.query.filter(
-            (User.username.ilike(search_pattern)) |
-            (User.email.ilike(search_pattern))
-        ).filter_by(is_active=True).paginate(
+        """Search active users by username or email substring.
+
+        Answered from the search index instead of an ILIKE table scan. The
+        index is built from the database on first use; after that each
+        search first applies the change log entries written since the
+        last one (a primary key range read, usually empty).
+        """
+        _sync_search_index()
+        page = max(page, 1)
+        ids, total = _search_index.search(
+            query, limit=per_page, offset=(page - 1) * per_page
+        )
+        users_by_id = {}
+        if ids:
+            users_by_id = {u.id: u for u in User.query.filter(User.id.in_(ids))}
+        items = [users_by_id[i] for i in ids if i in users_by_id]
+        return IndexPage(items, total, page, per_page)
+
+
+class PostService:
+    """Service class for post operations.
+
+    The batch methods load related data for a whole page of users in one
+    query, instead of one `user.posts` query per user.
+    """
+    
+    @staticmethod
+    def get_posts_for_user(user_id, page=1, per_page=10):
+        """Get a user's posts, newest first, with pagination."""
+        return Post.query.filter_by(user_id=user_id).order_by(
+            Post.created_at.desc(), Post.id.desc()
+        ).paginate(
             page=page,
             per_page=per_page,
             error_out=False
         )
+    
+    @staticmethod
+    def get_posts_counts(user_ids):
+        """Get the number of posts per user with one GROUP BY query."""
+        if not user_ids:
+            return {}
+        rows = db.session.query(Post.user_id, func.count(Post.id)).filter(
+            Post.user_id.in_(user_ids)
+        ).group_by(Post.user_id)
+        counts = {user_id: 0 for user_id in user_ids}
+        counts.update(dict(rows))
+        return counts
+    
+    @staticmethod
+    def get_recent_posts(user_ids, limit=3):
+        """Get each user's `limit` newest posts with one windowed query."""
+        if not user_ids:
+            return {}
+        row_number = func.row_number().over(
+            partition_by=Post.user_id,
+            order_by=(Post.created_at.desc(), Post.id.desc())
+        ).label('row_number')
+        ranked = db.session.query(Post.id, row_number).filter(
+            Post.user_id.in_(user_ids)
+        ).subquery()
+        posts = Post.query.join(ranked, Post.id == ranked.c.id).filter(
+            ranked.c.row_number <= limit
+        ).order_by(Post.user_id, ranked.c.row_number)
+        
+        recent = {user_id: [] for user_id in user_ids}
+        for post in posts:
+            recent[post.user_id].append(post)
+        return recent
 
 
 # TODO: Ask Copilot with @workspace:
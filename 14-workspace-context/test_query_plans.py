@@ -0,0 +1,92 @@
+"""
+Test Query Plans
+================
+Pins the hot endpoints to index lookups and a fixed number of queries.
+
+Runs the requests of benchmarks/check_query_plans.py under
+assert_no_full_scans, and uses query_counter to catch N+1 regressions,
+against a small seeded in-memory database.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:test_query_plans.py Add a query budget test for the search endpoint"
+"""
+
+import pytest
+
+from app import create_app
+from benchmarks.check_query_plans import CHECKED_TABLES, HOT_REQUESTS, seed
+from cache import NullCache
+from migrations import upgrade
+from models import db
+from query_counter import assert_max_queries, count_queries
+from query_plans import assert_no_full_scans
+from routes import clear_list_response_cache
+from services import UserService
+
+
+@pytest.fixture(scope='module')
+def client():
+    """A test client for an app with 300 seeded users and their posts."""
+    app = create_app('testing')
+    app.config['SQLALCHEMY_ECHO'] = False
+    with app.app_context():
+        upgrade(db.engine)
+        seed(300)
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def no_response_or_user_cache(client):
+    """Make every request reach the database, whatever earlier tests cached.
+
+    Clears the list response cache and disables the user cache for the
+    test, restoring the user cache afterwards.
+    """
+    clear_list_response_cache()
+    previous = UserService.configure_cache(NullCache())
+    yield
+    UserService.configure_cache(previous)
+
+
+@pytest.mark.parametrize('path', HOT_REQUESTS)
+def test_hot_requests_use_indexes(client, path):
+    with assert_no_full_scans(db.engine, tables=CHECKED_TABLES):
+        response = client.get(path)
+    assert response.status_code == 200
+
+
+def test_second_cursor_page_uses_indexes(client):
+    first = client.get('/api/users?mode=cursor&per_page=20').get_json()
+    with assert_no_full_scans(db.engine, tables=CHECKED_TABLES):
+        response = client.get(f'/api/users?after={first["next"]}&per_page=20')
+    assert response.status_code == 200
+
+
+def test_assert_no_full_scans_reports_table_scan(client):
+    with pytest.raises(AssertionError, match='scan a whole table'):
+        with assert_no_full_scans(db.engine, tables=CHECKED_TABLES):
+            db.session.execute(db.text("SELECT * FROM users WHERE password_hash = 'x'")).all()
+
+
+def test_list_with_posts_loads_related_data_in_batches(client):
+    # Page, total, post counts and recent posts: no query per user
+    with assert_max_queries(db.engine, 4):
+        response = client.get('/api/users?include=posts_count,recent_posts&per_page=50')
+    assert len(response.get_json()['users']) == 50
+
+
+def test_count_queries_records_statements(client):
+    # User lookup, one page of posts and its total
+    with count_queries(db.engine) as counter:
+        client.get('/api/users/5/posts')
+    assert counter.count == 3
+    assert all(s.lstrip().startswith('SELECT') for s in counter.statements)
+
+
+def test_assert_max_queries_lists_statements_when_exceeded(client):
+    with pytest.raises(AssertionError, match='Expected at most 1 queries, got 2'):
+        with assert_max_queries(db.engine, 1):
+            client.get('/api/users?page=2')
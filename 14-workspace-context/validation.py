@@ -0,0 +1,83 @@
+"""
+User Field Validation
+=====================
+Username, email and password validation shared by the sync and async services and
+the bulk importer.
+
+The patterns are compiled once at import time instead of being looked up
+in `re`'s internal cache on every call, and matched with `fullmatch`, so
+a trailing newline no longer slips past a `$` anchor. `validate_many`
+checks a whole batch of records in one pass and reports an error (or
+None) per record, which is what the bulk import endpoint needs.
+
+Run benchmarks/bench_validation.py to measure validations per second.
+
+EXERCISE:
+Open Copilot Chat and ask:
+- "#file:validation.py Explain the email pattern piece by piece"
+- "@workspace Where is user input validated before it reaches the database?"
+"""
+
+import re
+
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+USERNAME_PATTERN = re.compile(r'[a-zA-Z0-9_]+')
+
+USERNAME_MIN_LENGTH = 3
+USERNAME_MAX_LENGTH = 80
+
+
+def validate_email(email):
+    """Return True if an email address is well formed."""
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+
+def validate_username(username):
+    """Validate a username; return (is_valid, error_message)."""
+    if len(username) < USERNAME_MIN_LENGTH:
+        return False, f"Username must be at least {USERNAME_MIN_LENGTH} characters"
+    if len(username) > USERNAME_MAX_LENGTH:
+        return False, f"Username must be less than {USERNAME_MAX_LENGTH} characters"
+    if USERNAME_PATTERN.fullmatch(username) is None:
+        return False, "Username can only contain letters, numbers, and underscores"
+    return True, None
+
+
+def validate_password(password):
+    """Validate a password; return (is_valid, error_message)."""
+    if not isinstance(password, str) or not password:
+        return False, "password must be a non-empty string"
+    return True, None
+
+
+def validate_record(record):
+    """Validate one user record; return an error message or None."""
+    if not isinstance(record, dict):
+        return "Record must be a JSON object"
+    missing = [f for f in ('username', 'email') if f not in record]
+    if missing:
+        return f"Missing fields: {missing}"
+    username = record['username']
+    email = record['email']
+    if not isinstance(username, str) or not isinstance(email, str):
+        return "username and email must be strings"
+    is_valid, error = validate_username(username)
+    if not is_valid:
+        return error
+    if EMAIL_PATTERN.fullmatch(email) is None:
+        return "Invalid email format"
+    if 'password' in record:
+        is_valid, error = validate_password(record['password'])
+        if not is_valid:
+            return error
+    return None
+
+
+def validate_many(records):
+    """Validate a batch of user records.
+
+    Returns a list with one entry per record, in order: None when the
+    record is valid, otherwise its error message.
+    """
+    return [validate_record(record) for record in records]